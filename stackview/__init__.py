@@ -9,6 +9,7 @@ from ._annotate import annotate
 from ._utilities import _no_resize
 from ._interact import interact
 from ._slice import slice
+from ._open import open
 from ._curtain import curtain
 from ._orthogonal import orthogonal
 from ._side_by_side import side_by_side
@@ -1,4 +1,4 @@
-def animate(timelapse, filename:str=None, overwrite_file:bool=True, frame_delay_ms:int=150, num_loops:int=1000, colormap=None, display_min=None, display_max=None, zoom_factor:float=1.0):
+def animate(timelapse, filename:str=None, overwrite_file:bool=True, frame_delay_ms:int=150, num_loops:int=1000, colormap=None, display_min=None, display_max=None, zoom_factor:float=1.0, image_format:str=None):
     """
     Create an animated GIF from a list of 2D images and return it as Markdown object, that can be shown in Jupyter notebooks.
     RGB images are supported as well, but no 3D image stacks.
@@ -25,45 +25,72 @@ def animate(timelapse, filename:str=None, overwrite_file:bool=True, frame_delay_
         Lower bound of properly shown intensities
     display_max: float, optional
         Upper bound of properly shown intensities
+    image_format: str, optional
+        "gif", "webp" or "mp4" (requires imageio-ffmpeg). WebP and MP4 files are much smaller for long
+        timelapses. By default, the format is derived from the filename and otherwise "gif".
     """
-    import os
-    import imageio
-    from IPython.display import HTML
     import numpy as np
     import warnings
-    from stackview._image_widget import _img_to_rgb
-    from ._utilities import numpy_to_gif_bytestream, _gif_to_html
+    from stackview._image_widget import _img_to_rgb, _img_to_indexed
+    from ._statistics import _image_statistics
 
     if isinstance(timelapse, list):
         timelapse = np.asarray(timelapse)
 
-    if 0 <= timelapse.min() <= 1 and 0 <= timelapse.max() <= 1:
+    statistics = _image_statistics(timelapse)
+    if 0 <= statistics.min <= 1 and 0 <= statistics.max <= 1:
         warnings.warn("The timelapse has a small intensity range between 0 and 1. Consider normalizing it to the range between 0 and 255.")
-    if timelapse.min() < 0 or timelapse.max() > 255:
+    if statistics.min < 0 or statistics.max > 255:
         warnings.warn("The timelapse has an intensity range exceeding 0..255. Consider normalizing it to the range between 0 and 255.")
 
-    image_rgb = np.asarray([_img_to_rgb(i, colormap=colormap, display_min=display_min, display_max=display_max) for i in timelapse]).astype(np.uint8)
+    # frames are colorized one by one while encoding
+    palette = None
+    if _img_to_indexed(timelapse[0]) is not None:
+        # intensity images are written as indices into the colormap, which serves as palette of all frames
+        frames = (_img_to_indexed(i, colormap=colormap, display_min=display_min, display_max=display_max)[0] for i in timelapse)
+        palette = _img_to_indexed(timelapse[0], colormap=colormap)[1]
+    else:
+        frames = (_img_to_rgb(i, colormap=colormap, display_min=display_min, display_max=display_max) for i in timelapse)
+
+    return _animate_frames(frames, len(timelapse), tuple(timelapse.shape[1:3]), filename=filename, overwrite_file=overwrite_file,
+                           frame_delay_ms=frame_delay_ms, num_loops=num_loops, zoom_factor=zoom_factor,
+                           image_format=image_format, palette=palette)
+
+
+def _animate_frames(frames, num_frames, frame_shape, filename:str=None, overwrite_file:bool=True, frame_delay_ms:int=150,
+                    num_loops:int=1000, zoom_factor:float=1.0, image_format:str=None, palette=None):
+    """Encodes frames into an animation, saves it to a file and returns it as HTML object. See animate()."""
+    import os
+    import warnings
+    import numpy as np
+    from IPython.display import HTML
+    from ._utilities import _encode_animation, _animation_to_html
+
+    if image_format is None:
+        image_format = "gif"
+        if filename is not None and os.path.splitext(filename)[1].lower() in [".webp", ".mp4"]:
+            image_format = os.path.splitext(filename)[1].lower()[1:]
+
+    if num_frames * np.prod(frame_shape) * 3 > 1024 * 1024 * 10:
+        warnings.warn("The image is quite large (> 10 MByte) and might not be properly shown in the notebook when rendered over the internet. Consider subsampling or cropping the image for visualization purposes.")
+
+    animation = _encode_animation(frames, image_format, frame_delay_ms=frame_delay_ms, num_loops=num_loops, palette=palette)
 
     if filename is not None:
-        if not filename.endswith(".gif"):
-            filename += ".gif"
+        extension = "." + image_format
+        if not filename.lower().endswith(extension):
+            filename += extension
         if not overwrite_file:
             i = 0
             original_filename = filename
             while os.path.exists(filename):
                 i += 1
-                filename = original_filename.replace(".gif", f"_{i:02}.gif")
-
-        with imageio.get_writer(filename, mode='I', duration=frame_delay_ms, loop=num_loops) as writer:
-            for frame in image_rgb:
-                writer.append_data(frame)
-
+                filename = original_filename[:-len(extension)] + f"_{i:02}" + extension
 
-    if np.prod(image_rgb.shape) > 1024 * 1024 * 10:
-        warnings.warn("The image is quite large (> 10 MByte) and might not be properly shown in the notebook when rendered over the internet. Consider subsampling or cropping the image for visualization purposes.")
+        with open(filename, "wb") as file:
+            file.write(animation)
 
-    bytestream = numpy_to_gif_bytestream(image_rgb, frame_delay_ms=frame_delay_ms, num_loops=num_loops)
-    return HTML(_gif_to_html(bytestream, width=int(image_rgb.shape[-2] * zoom_factor)))
+    return HTML(_animation_to_html(animation, width=int(frame_shape[1] * zoom_factor), image_format=image_format))
 
 def animate_curtain(timelapse, timelapse_curtain,
                     axis: int = 0,
@@ -116,6 +143,7 @@ def animate_curtain(timelapse, timelapse_curtain,
     """
     import numpy as np
     from ._image_widget import _img_to_rgb
+    from ._utilities import _shared_palette
 
 
     if isinstance(timelapse, list):
@@ -126,27 +154,36 @@ def animate_curtain(timelapse, timelapse_curtain,
 
     max_size = timelapse.shape[1]
 
-    images = []
     steps = list(range(0, max_size + 1, int(max_size / num_steps * 2)))
-    steps = steps + steps[::-1]
-
-    for slider_value in steps:
-        if len(timelapse.shape) < 3 or (len(timelapse.shape) == 3 and timelapse.shape[-1] == 3):
-            image_slice = _img_to_rgb(timelapse.copy(), colormap=colormap, display_min=display_min, display_max=display_max)
-            image_slice_curtain = _img_to_rgb(timelapse_curtain, colormap=curtain_colormap, display_min=curtain_display_min,
-                                              display_max=curtain_display_max)
-        else:
-            image_slice = _img_to_rgb(np.take(timelapse, slider_value, axis=axis), colormap=colormap,
-                                      display_min=display_min, display_max=display_max)
-            image_slice_curtain = _img_to_rgb(np.take(timelapse_curtain, slider_value, axis=axis),
-                                              colormap=curtain_colormap, display_min=curtain_display_min,
-                                              display_max=curtain_display_max)
-        image_slice[:, slider_value:] = (1 - alpha) * image_slice[:, slider_value:] + \
-                                                alpha * image_slice_curtain[:, slider_value:]
-
-        images.append(image_slice)
-
-    return animate(np.asarray(images), filename=filename, overwrite_file=overwrite_file, frame_delay_ms=frame_delay_ms, num_loops=num_loops, zoom_factor=zoom_factor)
+
+    def colorize(image_slice, image_slice_curtain):
+        """Returns the colorized image and the image with the curtain on top."""
+        image_slice = _img_to_rgb(image_slice, colormap=colormap, display_min=display_min, display_max=display_max)
+        image_slice_curtain = _img_to_rgb(image_slice_curtain, colormap=curtain_colormap, display_min=curtain_display_min,
+                                          display_max=curtain_display_max)
+        mixed = ((1 - alpha) * image_slice + alpha * image_slice_curtain).astype(np.uint8)
+        return np.asarray(image_slice).astype(np.uint8), mixed
+
+    if len(timelapse.shape) < 3 or (len(timelapse.shape) == 3 and timelapse.shape[-1] == 3):
+        # both images are colorized once; each frame takes its columns from either of them
+        image_slice, mixed = colorize(timelapse, timelapse_curtain)
+        behind_curtain = np.arange(image_slice.shape[1])[np.newaxis, :] >= np.asarray(steps)[:, np.newaxis]
+        images = list(np.where(behind_curtain[:, np.newaxis, :, np.newaxis], mixed, image_slice))
+    else:
+        images = []
+        for slider_value in steps:
+            image_slice, mixed = colorize(np.take(timelapse, slider_value, axis=axis), np.take(timelapse_curtain, slider_value, axis=axis))
+            image_slice[:, slider_value:] = mixed[:, slider_value:]
+            images.append(image_slice)
+
+    # the curtain goes back showing the same frames
+    images = images + images[::-1]
+
+    # one palette for all frames, from frames showing only the curtain, half of each and only the image
+    palette = _shared_palette([images[0], images[len(images) // 4], images[len(images) // 2 - 1]])
+
+    return _animate_frames(images, len(images), images[0].shape[:2], filename=filename, overwrite_file=overwrite_file,
+                           frame_delay_ms=frame_delay_ms, num_loops=num_loops, zoom_factor=zoom_factor, palette=palette)
 
 def animate_blend(
         image1,
@@ -203,26 +240,26 @@ def animate_blend(
     """
     import numpy as np
     from ._image_widget import _img_to_rgb
+    from ._utilities import _shared_palette
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image1)):
-        image1 = image1.get()
-
-    if 'cupy.ndarray' in str(type(image2)):
-        image2 = image2.get()
+    image1 = _as_array(image1, device=False)
+    image2 = _as_array(image2, device=False)
 
     # Convert images to RGB
     image1_rgb = _img_to_rgb(image1, colormap=colormap1, display_min=display_min1, display_max=display_max1)
     image2_rgb = _img_to_rgb(image2, colormap=colormap2, display_min=display_min2, display_max=display_max2)
 
-    # Create frames with different blend factors
-    frames = []
-    for i in range(num_steps):
-        blend_factor = i / (num_steps - 1)
-        blended = (1 - blend_factor) * image1_rgb + blend_factor * image2_rgb
-        frames.append(blended.astype(np.uint8))
+    # Create all frames with different blend factors at once, in 8-bit fixed point arithmetic
+    weights = np.round(np.linspace(0, 256, num_steps)).astype(np.uint16)[:, np.newaxis, np.newaxis, np.newaxis]
+    blended = np.asarray(image1_rgb).astype(np.uint16) * (256 - weights) + np.asarray(image2_rgb).astype(np.uint16) * weights
+    frames = list((blended >> 8).astype(np.uint8))
 
     # Add reverse frames to create a smooth loop
-    frames.extend(frames[::-1])
+    frames = frames + frames[::-1]
+
+    # one palette for all frames, from both images and their mix
+    palette = _shared_palette([image1_rgb, image2_rgb, frames[num_steps // 2]])
 
-    return animate(np.asarray(frames), filename=filename, overwrite_file=overwrite_file,
-                  frame_delay_ms=frame_delay_ms, num_loops=num_loops, zoom_factor=zoom_factor)
+    return _animate_frames(frames, len(frames), frames[0].shape[:2], filename=filename, overwrite_file=overwrite_file,
+                           frame_delay_ms=frame_delay_ms, num_loops=num_loops, zoom_factor=zoom_factor, palette=palette)
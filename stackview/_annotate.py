@@ -64,19 +64,18 @@ def annotate(
     An ipywidget with an image display, a slider and a label showing mouse position and intensity.
     """
     from ._utilities import _no_resize
-    from ._image_widget import _is_label_image, _img_to_rgb
+    from ._image_widget import _is_label_image, _img_to_rgb, _labels_to_rgb
     import ipywidgets
     from ._image_widget import ImageWidget
     import numpy as np
     from ipyevents import Event
     from ._uint_field import UIntField
     from ._slice_viewer import _SliceViewer
+    from ._compositing import _Compositor
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
-
-    if 'cupy.ndarray' in str(type(labels)):
-        labels = labels.get()
+    image = _as_array(image, device=False)
+    labels = _as_array(labels, device=False)
 
     if not _is_label_image(labels):
         warnings.warn("Labels are not an image of type uint32 or uint64. Consider converting to this type for best performance.")
@@ -98,28 +97,64 @@ def annotate(
                           display_max=display_max,
                           slider_text=slider_text)
     view = viewer.view
+    # label boundaries and colours must not be blurred by lossy compression
+    view.lossless = True
     # setup user interface for changing the slice
     slice_slider = viewer.slice_slider
 
 
+    # display range of the current slice, so that partial updates while drawing look like full updates
+    slice_display_range = [display_min, display_max]
+
+    compositor = _Compositor()
+
+    def mix(slice_image1, slice_image2, out=None):
+        rgb_image1 = _img_to_rgb(slice_image1, colormap=colormap, display_min=slice_display_range[0], display_max=slice_display_range[1])
+        # labels are always shown in colour, independent of their pixel type
+        rgb_image2 = _labels_to_rgb(slice_image2)
+
+        return compositor.composite([rgb_image1, rgb_image2], alphas=[1, alpha], out=out)
+
     # event handler when the user changed the slider:
     def update_display(event=None):
         slice_image1 = viewer.get_view_slice()
         slice_image2 = viewer.get_view_slice(labels)
 
-        if not _is_label_image(slice_image2):
-            # necessary to display the labels in colour correctly
-            slice_image2 = slice_image2.astype(np.uint64)
+        if display_min is None:
+            slice_display_range[0] = slice_image1.min()
+        if display_max is None:
+            slice_display_range[1] = slice_image1.max()
+
+        view.data = mix(slice_image1, slice_image2)
 
-        rgb_image1 = _img_to_rgb(slice_image1, colormap=colormap, display_min=display_min, display_max=display_max)
-        rgb_image2 = _img_to_rgb(slice_image2, colormap=colormap, display_min=display_min, display_max=display_max)
+    # bounding box [y0, y1, x0, x1] of everything drawn since the last update
+    dirty_region = [None, None, None, None]
 
-        factor1 = 1.0 - alpha
-        factor2 = alpha
+    def mark_dirty(x, y, radius):
+        y0, y1 = int(np.floor(y - radius)), int(np.ceil(y + radius)) + 1
+        x0, x1 = int(np.floor(x - radius)), int(np.ceil(x + radius)) + 1
+        if dirty_region[0] is not None:
+            y0, y1 = min(y0, dirty_region[0]), max(y1, dirty_region[1])
+            x0, x1 = min(x0, dirty_region[2]), max(x1, dirty_region[3])
+        dirty_region[:] = [y0, y1, x0, x1]
 
-        rgb_mix = factor1 * rgb_image1 + factor2 * rgb_image2
+    def current_plane(data):
+        for index in viewer.get_slice_index():
+            data = data[index]
+        return data
 
-        view.data = rgb_mix
+    # re-render only the part of the view where labels were drawn
+    def update_dirty_region():
+        if dirty_region[0] is None:
+            return
+        labels_2d = current_plane(labels)
+        y0, y1 = max(0, dirty_region[0]), min(labels_2d.shape[0], dirty_region[1])
+        x0, x1 = max(0, dirty_region[2]), min(labels_2d.shape[1], dirty_region[3])
+        dirty_region[:] = [None, None, None, None]
+        if y1 <= y0 or x1 <= x0:
+            return
+        patch = mix(current_plane(image)[y0:y1, x0:x1], labels_2d[y0:y1, x0:x1], out=np.empty((y1 - y0, x1 - x0, 3), dtype=np.uint8))
+        view.update_region(y0, y1, x0, x1, patch)
 
     # user interface for drawing
     label_id_slider = UIntField(1)
@@ -157,12 +192,8 @@ def annotate(
         absolute_position_x = int(relative_position_x)
         absolute_position_y = int(relative_position_y)
 
-        labels_2d = labels
         # differentiate nd/2D drawing
-        slice_indices = viewer.get_slice_index()
-        while len(slice_indices) > 0:
-            index = slice_indices.pop(0)
-            labels_2d = labels_2d[index]
+        labels_2d = current_plane(labels)
         position = [absolute_position_x, absolute_position_y, label_id_to_draw]
 
         # compare position and label with last known postion. If equal, don't update / redraw
@@ -177,6 +208,7 @@ def annotate(
                     radius,
                     label_id_to_draw,
                     labels_2d)
+        mark_dirty(absolute_position_x, absolute_position_y, radius)
 
         # draw circles along a line we've beend drawing
         if former_drawn_position[0] is not None:
@@ -192,12 +224,13 @@ def annotate(
                             radius,
                             label_id_to_draw,
                             labels_2d)
+                mark_dirty(position_to_draw[0], position_to_draw[1], radius)
 
         # store position
         for i in range(4):
             if i < len(position):
                 former_drawn_position[i] = position[i]
-        update_display()
+        update_dirty_region()
 
     # draw everything once
     update_display()
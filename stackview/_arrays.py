@@ -0,0 +1,122 @@
+from functools import lru_cache
+
+import numpy as np
+
+# supported array types, identified by (top-level module, class name), and the backend handling them
+_ARRAY_TYPES = {
+    ("cupy", "ndarray"): "cupy",
+    ("dask", "Array"): "dask",
+    ("resource_backed_dask_array", "ResourceBackedDaskArray"): "dask",
+    ("xarray", "DataArray"): "xarray",
+    ("torch", "Tensor"): "torch",
+    ("zarr", "Array"): "zarr",
+    ("pyclesperanto_prototype", "CUDAArray"): "opencl",
+    ("pyclesperanto_prototype", "OCLArray"): "opencl",
+}
+
+
+class _ArrayHandle():
+    """
+    Lazy, sliceable handle of an image from any supported array library (numpy, cupy,
+    dask, xarray, torch, zarr, pyclesperanto). Only requested planes are read or transferred.
+    """
+    def __init__(self, image, device:bool=True):
+        self.array = _as_array(image, device=device)
+
+    @property
+    def shape(self):
+        return tuple(self.array.shape)
+
+    @property
+    def dtype(self):
+        return _numpy_dtype(self.array)
+
+    @property
+    def ndim(self):
+        return len(self.array.shape)
+
+    def get_plane(self, index):
+        """Returns the plane at the given index as numpy array, or as cupy array for images on the GPU."""
+        return _get_plane(self.array, tuple(index))
+
+    def stats(self, sample:bool=False):
+        """Returns the (cached) _ImageStatistics of the image."""
+        from ._statistics import _image_statistics
+        return _image_statistics(self.array, sample=sample)
+
+
+def _backend(image):
+    """Returns the name of the backend handling the image, or None if it is not a supported array."""
+    return _backend_of_type(type(image))
+
+
+@lru_cache(maxsize=None)
+def _backend_of_type(array_type):
+    if issubclass(array_type, np.ndarray):
+        return "numpy"
+    return _ARRAY_TYPES.get((array_type.__module__.split('.')[0], array_type.__name__))
+
+
+def _as_array(image, device:bool=True):
+    """Returns the cheapest array representation of an image that can be sliced like a numpy array.
+
+    In-memory data is wrapped without copying: xarray DataArrays are unwrapped and CPU torch
+    tensors become numpy arrays sharing their memory. Lazy arrays (dask, zarr) stay lazy.
+    GPU arrays stay on the GPU (CUDA torch tensors become cupy arrays via DLPack if cupy is
+    installed), unless device=False, in which case they are copied to the host.
+    """
+    backend = _backend(image)
+    if backend == "xarray":
+        return _as_array(image.data, device=device)
+    if backend == "torch":
+        image = image.detach()
+        if image.device.type == "cpu":
+            return image.numpy()
+        if not device:
+            return image.cpu().numpy()
+        try:
+            import cupy
+        except ImportError:
+            return image
+        return cupy.from_dlpack(image)
+    if backend in ["cupy", "opencl"] and not device:
+        return image.get()
+    return image
+
+
+def _is_mutable(image):
+    """True for writeable in-memory arrays, which may be modified in place at any time, also while
+    they are shown. Read-only arrays (e.g. memory-mapped files) and lazy arrays are considered unchanging."""
+    image = _as_array(image)
+    backend = _backend(image)
+    if backend == "numpy":
+        return image.flags.writeable
+    return backend in ["cupy", "torch", "opencl"]
+
+
+def _get_plane(image, index):
+    """Returns the plane at the given index. All indices are applied at once, so that lazy arrays
+    (dask, zarr, memory-mapped files, ...) only read and GPU arrays only transfer the visible plane.
+    Planes of cupy arrays stay on the GPU.
+    """
+    if len(index) > 0:
+        image = image[index]
+    if _backend(image) == "cupy":
+        return image
+    return _to_numpy(image)
+
+
+def _to_numpy(image):
+    """Returns the image as numpy array, computing lazy arrays and transferring GPU arrays."""
+    image = _as_array(image, device=False)
+    if hasattr(image, 'compute'):
+        image = image.compute()
+    return np.asarray(image)
+
+
+def _numpy_dtype(image):
+    dtype = image.dtype
+    if _backend(image) == "torch":
+        # e.g. torch.float32
+        return np.dtype(str(dtype).replace("torch.", ""))
+    return np.dtype(dtype)
@@ -58,12 +58,6 @@ def blend(
     from ._utilities import _no_resize
     from ._uint_field import intSlider
 
-    if 'cupy.ndarray' in str(type(image1)):
-        image1 = image1.get()
-
-    if 'cupy.ndarray' in str(type(image2)):
-        image2 = image2.get()
-
     # setup user interface for changing the blend factor
     blend_slider = intSlider(
         value=blend_factor,
@@ -74,14 +68,13 @@ def blend(
     )
 
     viewer = None
-    from ._image_widget import _img_to_rgb
+    from ._compositing import _Compositor, _ColorizedSlices
+    compositor = _Compositor()
 
     def transform_image():
-        image_slice1 = _img_to_rgb(viewer.get_view_slice(), colormap=colormap1, display_min=display_min1, display_max=display_max1).copy()
-        image_slice2 = _img_to_rgb(viewer.get_view_slice(image2), colormap=colormap2, display_min=display_min2, display_max=display_max2)
+        image_slice1, image_slice2 = colorized_slices()
         blend_value = blend_slider.value / 100
-        blended_image = (1 - blend_value) * image_slice1 + blend_value * image_slice2
-        return blended_image
+        return compositor.composite([image_slice1, image_slice2], alphas=[1, blend_value])
 
     viewer = _SliceViewer(image1, continuous_update=continuous_update, zoom_factor=zoom_factor,
                           zoom_spline_order=zoom_spline_order, colormap=colormap1, display_min=display_min1,
@@ -90,8 +83,17 @@ def blend(
     view = viewer.view
     sliders = viewer.slice_slider
 
+    # colorized slices of both images, recomputed only when the slice changes
+    colorized_slices = _ColorizedSlices(viewer, [
+        (None, colormap1, display_min1, display_max1),
+        (image2, colormap2, display_min2, display_max2),
+    ])
+
     # event handler when the user changed something:
     def configuration_updated(event=None):
+        if event is None:
+            # explicit update, e.g. after the images were modified
+            colorized_slices.invalidate()
         view.data = transform_image()
 
     configuration_updated(None)
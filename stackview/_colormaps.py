@@ -119,6 +119,34 @@ def _labels_lut():
     return lut
 
 
+@lru_cache(maxsize=16)
+def _colormap_lut(colormap=None):
+    """
+    Return a read-only (256, 3) uint8 lookup table for a given colormap name.
+    A colormap of None results in a grey-value ramp.
+    """
+    import numpy as np
+
+    if colormap is None:
+        lut = np.repeat(np.arange(256, dtype=np.uint8)[:, np.newaxis], 3, axis=1)
+    else:
+        colors = np.asarray(create_colormap(colormap).colors)[:256, :3]
+        lut = np.ascontiguousarray((colors * 255).astype(np.uint8))
+    lut.flags.writeable = False
+    return lut
+
+
+@lru_cache(maxsize=1)
+def _labels_lut_uint8():
+    """
+    Return the label colours of _labels_lut() as read-only (65536, 3) uint8 lookup table.
+    """
+    import numpy as np
+    lut = np.ascontiguousarray((_labels_lut()[:65536] * 255).astype(np.uint8))
+    lut.flags.writeable = False
+    return lut
+
+
 def _convert_to_listed_colormap(colormap, num_samples):
     import numpy as np
     from matplotlib.colors import ListedColormap
@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class _Compositor():
+    """
+    Composites uint8 RGB(A) layers with 8-bit fixed point arithmetic, e.g. for showing labels
+    or a second image on top of an image.
+
+    Weights are alpha * 256, so that blending a layer over a target is
+    (target * (256 - weight) + layer * weight) >> 8 in uint16. The intermediate buffers are
+    kept and reused for subsequent frames.
+    """
+    def __init__(self):
+        self._scratch = [np.empty(0, dtype=np.uint16), np.empty(0, dtype=np.uint16)]
+
+    def composite(self, layers, alphas=None, modes="over", out=None):
+        """Composites layers from bottom to top and returns the result.
+
+        Parameters
+        ----------
+        layers: list of images
+            RGB(A) images of the same shape; non-uint8 images are clipped to 0..255
+        alphas: list of float, optional
+            Opacity of each layer between 0 and 1, default: 1
+        modes: str or list of str, optional
+            How each layer is combined with the layers below: "over" (alpha blending),
+            "add" (saturating sum) or "max" (maximum)
+        out: np.ndarray, optional
+            uint8 array the result is written to, e.g. a buffer owned by the caller which is reused
+            between frames. By default, a new array is returned.
+        """
+        from ._image_widget import _to_uint8
+
+        layers = [_to_uint8(np.asarray(layer)) for layer in layers]
+        if alphas is None:
+            alphas = [1] * len(layers)
+        if isinstance(modes, str):
+            modes = [modes] * len(layers)
+
+        if out is None:
+            # results are handed out, e.g. as widget data, and must not change with the next frame
+            out = np.empty(layers[0].shape, dtype=np.uint8)
+
+        if not (modes[0] == "over" and alphas[0] >= 1):
+            # the bottom layer is blended over black
+            out[...] = 0
+        for layer, alpha, mode in zip(layers, alphas, modes):
+            self.blend(out, layer, alpha, mode)
+        return out
+
+    def blend(self, target, layer, alpha:float=1, mode:str="over"):
+        """Combines a layer with a uint8 target (or a view of it) of the same shape in place."""
+        from ._image_widget import _to_uint8
+        layer = _to_uint8(np.asarray(layer))
+        weight = int(np.clip(round(alpha * 256), 0, 256))
+        if weight == 0:
+            return target
+
+        if mode == "over" and weight == 256:
+            np.copyto(target, layer)
+            return target
+        if mode == "max" and weight == 256:
+            np.maximum(target, layer, out=target)
+            return target
+
+        accumulator, weighted_layer = self._scratch_buffers(target.shape)
+        np.multiply(layer, weight, out=weighted_layer, dtype=np.uint16)
+        if mode == "over":
+            np.multiply(target, 256 - weight, out=accumulator, dtype=np.uint16)
+            np.add(accumulator, weighted_layer, out=accumulator)
+            np.right_shift(accumulator, 8, out=accumulator)
+        elif mode == "add":
+            np.right_shift(weighted_layer, 8, out=weighted_layer)
+            np.add(target, weighted_layer, out=accumulator, dtype=np.uint16)
+            np.minimum(accumulator, 255, out=accumulator)
+        elif mode == "max":
+            np.right_shift(weighted_layer, 8, out=weighted_layer)
+            np.maximum(target, weighted_layer, out=accumulator, dtype=np.uint16)
+        else:
+            raise ValueError("Unsupported compositing mode: " + str(mode))
+        np.copyto(target, accumulator, casting="unsafe")
+        return target
+
+    def _scratch_buffers(self, shape):
+        size = int(np.prod(shape))
+        for i, buffer in enumerate(self._scratch):
+            if buffer.size < size:
+                self._scratch[i] = np.empty(size, dtype=np.uint16)
+        return [buffer[:size].reshape(shape) for buffer in self._scratch]
+
+
+class _ColorizedSlices():
+    """
+    RGB images of the current slice of a _SliceViewer and of further images of the same shape,
+    e.g. the layers of a curtain or blend widget. They are recomputed only when the slice changes
+    or after invalidate(), e.g. because the images were modified.
+
+    layers is a list of (image, colormap, display_min, display_max); image None stands for the
+    image of the viewer.
+    """
+    def __init__(self, viewer, layers):
+        self._viewer = viewer
+        self._layers = layers
+        self._index = None
+        self._rgb = None
+
+    def invalidate(self):
+        self._index = None
+
+    def __call__(self):
+        from ._image_widget import _img_to_rgb
+        index = tuple(self._viewer.get_slice_index())
+        if self._index != index:
+            self._rgb = tuple(_img_to_rgb(self._viewer.get_view_slice(image), colormap=colormap,
+                                          display_min=display_min, display_max=display_max)
+                              for image, colormap, display_min, display_max in self._layers)
+            self._index = index
+        return self._rgb
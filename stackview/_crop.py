@@ -41,9 +41,9 @@ def crop(image,
 
     """
     import warnings
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
+    image = _as_array(image, device=False)
 
     if len(image.shape) > 3:
         warnings.warn("Orthogonal views are only supported for 3D images. Consider using slice() instead.")
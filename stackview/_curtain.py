@@ -64,12 +64,6 @@ def curtain(
     from ._utilities import _no_resize
     from ._uint_field import intSlider
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
-
-    if 'cupy.ndarray' in str(type(image_curtain)):
-        image_curtain = image_curtain.get()
-
     # setup user interface for changing the curtain position
     slice_shape = list(image.shape)
     slice_shape.pop(axis)
@@ -88,14 +82,13 @@ def curtain(
     )
 
     viewer = None
-    from ._image_widget import _img_to_rgb
+    from ._compositing import _Compositor, _ColorizedSlices
+    compositor = _Compositor()
 
     def transform_image():
-        image_slice = _img_to_rgb(viewer.get_view_slice(), colormap=colormap, display_min=display_min, display_max=display_max).copy()
-        image_slice_curtain = _img_to_rgb(viewer.get_view_slice(image_curtain), colormap=curtain_colormap, display_min=curtain_display_min, display_max=curtain_display_max)
-        composited_image = image_slice.copy()
-        composited_image[:, curtain_slider.value:] = (1 - alpha) * composited_image[:, curtain_slider.value:] + \
-                                                     alpha * image_slice_curtain[:, curtain_slider.value:]
+        image_slice, image_slice_curtain = colorized_slices()
+        composited_image = compositor.composite([image_slice])
+        compositor.blend(composited_image[:, curtain_slider.value:], image_slice_curtain[:, curtain_slider.value:], alpha)
         return composited_image
 
     viewer = _SliceViewer(image, continuous_update=continuous_update, zoom_factor=zoom_factor,
@@ -105,8 +98,17 @@ def curtain(
     view = viewer.view  # ImageWidget(transform_image(), zoom_factor=zoom_factor, zoom_spline_order=zoom_spline_order)
     sliders = viewer.slice_slider
 
+    # colorized slices of both images, recomputed only when the slice changes
+    colorized_slices = _ColorizedSlices(viewer, [
+        (None, colormap, display_min, display_max),
+        (image_curtain, curtain_colormap, curtain_display_min, curtain_display_max),
+    ])
+
     # event handler when the user changed something:
     def configuration_updated(event=None):
+        if event is None:
+            # explicit update, e.g. after the images were modified
+            colorized_slices.invalidate()
         view.data = transform_image()
 
     configuration_updated(None)
@@ -0,0 +1,68 @@
+import numpy as np
+
+from ._arrays import _backend
+
+
+def _is_device_array(image):
+    """True for arrays living in GPU memory which can be sliced and processed on the device (cupy)."""
+    return _backend(image) == "cupy"
+
+
+def _array_module(image):
+    """Returns the array module (cupy or numpy) that operates on the given array."""
+    if _is_device_array(image):
+        import cupy
+        return cupy
+    return np
+
+
+def _to_host(array):
+    """Transfers a (small) device array, e.g. a plane or a rendered frame, into a numpy array."""
+    if _is_device_array(array):
+        return array.get()
+    return np.asarray(array)
+
+
+def _as_plane(data):
+    """Returns data as numpy array, unless it is a device array which is then kept on the device."""
+    if _is_device_array(data):
+        return data
+    return np.asarray(data)
+
+
+def _device_img_to_rgb(image, colormap=None, display_min=None, display_max=None):
+    """Colorizes a 2D image on the device it lives on and returns the (height, width, 3)
+    uint8 RGB image as numpy array, so that only the final frame is transferred to the host.
+
+    Works with numpy arrays as well, with the same result as _img_to_rgb.
+    """
+    from ._image_widget import _is_label_image, _to_uint8
+    from ._colormaps import _colormap_lut, _labels_lut_uint8
+    xp = _array_module(image)
+
+    if len(image.shape) > 2 and (image.shape[-1] == 3 or image.shape[-1] == 4):
+        return _to_uint8(_to_host(image))
+
+    if image.dtype == bool or _is_label_image(image):
+        lut = _labels_lut_uint8()
+        indices = image.astype(np.uint8) if image.dtype == bool else image
+        if _is_label_image(image) and int(image.max()) >= len(lut):
+            # label IDs beyond the size of the LUT wrap around, background stays black
+            indices = xp.where(image == 0, 0, xp.remainder(image - 1, len(lut) - 1) + 1)
+        return _to_host(xp.asarray(lut)[indices])
+
+    if display_min is None:
+        display_min = image.min()
+    if display_max is None:
+        display_max = image.max()
+    if image.dtype.kind in 'ui':
+        # like the precomputed LUTs for integer images on the host
+        display_min, display_max = float(display_min), float(display_max)
+    display_range_width = display_max - display_min
+    if display_range_width == 0:
+        display_range_width = 1
+
+    buffer = xp.subtract(image, display_min, dtype=np.result_type(image.dtype, np.float32))
+    xp.multiply(buffer, 255 / display_range_width, out=buffer)
+    xp.clip(buffer, 0, 255, out=buffer)
+    return _to_host(xp.asarray(_colormap_lut(colormap))[buffer.astype(np.uint8)])
@@ -45,9 +45,9 @@ def display_range(
     from ._image_widget import ImageWidget
     import numpy as np
     from ._utilities import _no_resize
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
+    image = _as_array(image, device=False)
 
     slice_slider = None
 
@@ -65,10 +65,13 @@ def display_range(
     if len(image.shape) < 3 or (len(image.shape) == 3 and image.shape[-1] == 3):
         slice_slider.layout.display = 'none'
 
-    if display_min is None:
-        display_min = np.min(image)
-    if display_max is None:
-        display_max = np.max(image)
+    if display_min is None or display_max is None:
+        from ._statistics import _image_statistics
+        statistics = _image_statistics(image)
+        if display_min is None:
+            display_min = statistics.min
+        if display_max is None:
+            display_max = statistics.max
 
     min_slider = ipywidgets.IntSlider(
         value=display_min,
@@ -86,18 +89,19 @@ def display_range(
         description="Maximum"
     )
 
-    from ._image_widget import _img_to_rgb
-    def transform_image():
+    def get_slice():
         if len(image.shape) < 3 or (len(image.shape) == 3 and image.shape[-1] == 3):
-            image_slice = _img_to_rgb(image.copy(), colormap=colormap, display_min=min_slider.value, display_max=max_slider.value)
-        else:
-            image_slice = _img_to_rgb(np.take(image, slice_slider.value, axis=axis), colormap=colormap, display_min=min_slider.value, display_max=max_slider.value)
-        return image_slice
-    view = ImageWidget(transform_image(), zoom_factor=zoom_factor, zoom_spline_order=zoom_spline_order)
+            return image
+        return np.take(image, slice_slider.value, axis=axis)
+    view = ImageWidget(get_slice(), zoom_factor=zoom_factor, zoom_spline_order=zoom_spline_order, colormap=colormap,
+                       display_min=min_slider.value, display_max=max_slider.value)
 
     # event handler when the user changed something:
     def configuration_updated(event=None):
-        view.data = transform_image()
+        # the widget caches a colour lookup table per display range, so no intensity conversion happens per frame
+        view.display_min = min_slider.value
+        view.display_max = max_slider.value
+        view.data = get_slice()
 
     configuration_updated(None)
 
@@ -42,22 +42,23 @@ def histogram(
     An ipywidget with an image display, a slider and a label showing mouse position and intensity.
     """
     from ._utilities import _no_resize
-    from ._image_widget import _img_to_rgb
+    from ._image_widget import _img_to_rgb, ImageWidget
     import ipywidgets
     from ipyevents import Event
     from ._slice_viewer import _SliceViewer
+    from ._statistics import _image_statistics
     import numpy as np
-    import matplotlib.pyplot as plt
     from ._grid import grid
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
+    image = _as_array(image, device=False)
 
     if slice_number is None:
         slice_number = int(image.shape[0] / 2)
 
-    total_min = float(image.min())
-    total_max = float(image.max())
+    statistics = _image_statistics(image)
+    total_min = float(statistics.min)
+    total_max = float(statistics.max)
 
     # Image view
     viewer = _SliceViewer(image,
@@ -78,48 +79,33 @@ def histogram(
                              'end_y': image.shape[-2],
                              }
 
-    def create_histogram_plot(image, x, y, width, height):
-        #return np.random.normal(50, y, (100, 100))
-        cropped_image = image[..., y:y+height, x:x+width]
+    # colorized slice, histograms and statistics of its regions, computed once per slice
+    current_slice = {'index': None, 'image': None, 'rgb': None, 'histograms': None, 'statistics': None}
 
-        min_val = np.min(cropped_image)
-        max_val = np.max(cropped_image)
+    def get_current_slice():
+        index = tuple(viewer.get_slice_index())
+        if current_slice['index'] != index:
+            slice_image = np.asarray(viewer.get_view_slice())
+            current_slice['index'] = index
+            current_slice['image'] = slice_image
+            current_slice['rgb'] = _img_to_rgb(slice_image, colormap=colormap, display_min=display_min, display_max=display_max)
+            current_slice['histograms'] = _RegionHistograms(slice_image, (total_min, total_max))
+            current_slice['statistics'] = _RegionStatistics(slice_image)
+        return current_slice
 
-        #histogram = np.histogram(cropped_image, bins=256, range=(0, 255))
-        # plot histogram and store histogram as numpy RGB array
-        plt.figure(figsize=(1.8, 1.4))
-        # measure how long this takes
-
-        plt.hist(cropped_image.flatten(), bins=32)
-        plt.xlim(total_min, total_max)
-        plt.yticks([])
-        plt.xticks([total_min, int((total_min + total_max) / 2), total_max])
-        plt.tight_layout()
-
-        from io import BytesIO
-        from PIL import Image
-
-        with BytesIO() as file_obj:
-            plt.savefig(file_obj, format='png')
-            plt.close()  # supress plot output
-            file_obj.seek(0)
-
-            # Open the image using PIL's Image.open() which accepts a file-like object
-            histogram_image = Image.open(file_obj)
-
-            # Convert the PIL image to a numpy array
-            return np.array(histogram_image)[...,:3], min_val, max_val
-
-    histogram_image, min_val, max_val = create_histogram_plot(image, 0, 0, image.shape[-2], image.shape[-1])
-    histogram_viewer = _SliceViewer(histogram_image)
+    histogram_view = ImageWidget(_histogram_to_rgb(get_current_slice()['histograms']()))
+    # all numbers refer to the current slice (or the drawn rectangle), the histogram covers the range of the whole image
+    slice_statistics = get_current_slice()['statistics']()
 
     width = image.shape[-1]
     height = image.shape[-2]
     layout = layout=ipywidgets.Layout(display="flex", max_height="25px")
     slice_lbl = ipywidgets.Label(f"(..., 0:{height}, 0:{width}", layout=layout)
     dtype_lbl = ipywidgets.Label(str(image.dtype), layout=layout)
-    min_intensity_lbl = ipywidgets.Label(str(min_val), layout=layout)
-    max_intensity_lbl = ipywidgets.Label(str(max_val), layout=layout)
+    min_intensity_lbl = ipywidgets.Label(_format_number(slice_statistics['min']), layout=layout)
+    max_intensity_lbl = ipywidgets.Label(_format_number(slice_statistics['max']), layout=layout)
+    mean_intensity_lbl = ipywidgets.Label(_format_number(slice_statistics['mean']), layout=layout)
+    std_intensity_lbl = ipywidgets.Label(_format_number(slice_statistics['std']), layout=layout)
 
     layout = ipywidgets.Layout(display="flex", justify_content="flex-end", min_width="50px", max_height="25px")
 
@@ -128,13 +114,20 @@ def histogram(
         [ipywidgets.Label("dtype", layout=layout), dtype_lbl],
         [ipywidgets.Label("min", layout=layout), min_intensity_lbl],
         [ipywidgets.Label("max", layout=layout), max_intensity_lbl],
+        [ipywidgets.Label("mean", layout=layout), mean_intensity_lbl],
+        [ipywidgets.Label("std", layout=layout), std_intensity_lbl],
     ])
+    # intensity range covered by the histogram
+    histogram_axis = ipywidgets.HBox([ipywidgets.Label(str(statistics.min)), ipywidgets.Label(str(statistics.max))],
+                                     layout=ipywidgets.Layout(justify_content="space-between", width="180px"))
 
     # event handler when the user changed the slider:
     def update_display(event=None):
-        slice_image1 = viewer.get_view_slice()
+        if event is None:
+            # explicit update, e.g. after the image was modified
+            current_slice['index'] = None
+        slice_data = get_current_slice()
 
-        rgb_image1 = _img_to_rgb(slice_image1, colormap=colormap, display_min=display_min, display_max=display_max)
         from ._add_bounding_boxes import add_bounding_boxes
         bb = None
         if former_drawn_position['state'] is not None:
@@ -144,17 +137,23 @@ def histogram(
                 'width': abs(former_drawn_position['start_x'] - former_drawn_position['end_x']),
                 'height': abs(former_drawn_position['start_y'] - former_drawn_position['end_y'])
             }
-            annotated_image = add_bounding_boxes(rgb_image1, [bb])
+            annotated_image = add_bounding_boxes(slice_data['rgb'], [bb])
             slice_lbl.value = f"(..., {bb['y']}:{bb['y']+bb['height']}, {bb['x']}:{bb['x']+bb['width']})"
         else:
-            annotated_image = rgb_image1
-
-        if former_drawn_position['state'] == "mouse-up" and bb is not None:
-            h_image, min_val, max_val = create_histogram_plot(slice_image1, bb['x'], bb['y'], bb['width'], bb['height'])
-            histogram_viewer.view.data = h_image
+            annotated_image = slice_data['rgb']
+
+        # the histogram and statistics follow the rectangle while drawing, otherwise they show the whole slice
+        region = () if bb is None else (bb['x'], bb['y'], bb['width'], bb['height'])
+        histogram_view.data = _histogram_to_rgb(slice_data['histograms'](*region))
+        region_statistics = slice_data['statistics'](*region)
+        if region_statistics is not None:
+            min_intensity_lbl.value = _format_number(region_statistics['min'])
+            max_intensity_lbl.value = _format_number(region_statistics['max'])
+            mean_intensity_lbl.value = _format_number(region_statistics['mean'])
+            std_intensity_lbl.value = _format_number(region_statistics['std'])
+
+        if former_drawn_position['state'] == "mouse-up":
             former_drawn_position['state'] = None
-            min_intensity_lbl.value = str(min_val)
-            max_intensity_lbl.value = str(max_val)
 
         view.data = annotated_image
 
@@ -162,10 +161,12 @@ def histogram(
     # user interface for histogram
     tool_box = ipywidgets.VBox([
         table,
-        histogram_viewer.view
+        histogram_view,
+        histogram_axis
     ])
 
-    event_handler = Event(source=view, watched_events=['mousemove'])
+    # at most 30 mouse move events per second
+    event_handler = Event(source=view, watched_events=['mousemove'], throttle_or_debounce='throttle', wait=33)
 
     if slice_slider is not None:
         # connect user interface with event
@@ -191,7 +192,7 @@ def histogram(
             if former_drawn_position['state'] == 'mouse-down':
                 # not clicked
                 former_drawn_position['state'] = 'mouse-up'
-                update_display()
+                update_display(event)
             return
 
         # compare position and last known position. If equal, don't update / redraw
@@ -207,12 +208,7 @@ def histogram(
         former_drawn_position['end_x'] = absolute_position_x
         former_drawn_position['end_y'] = absolute_position_y
 
-        x = min(former_drawn_position['start_x'], former_drawn_position['end_x'])
-        y = min(former_drawn_position['start_y'], former_drawn_position['end_y'])
-        w = abs(former_drawn_position['start_x'] - former_drawn_position['end_x'])
-        h = abs(former_drawn_position['start_y'] - former_drawn_position['end_y'])
-
-        #update_display()
+        update_display(event)
 
     # draw everything once
     update_display()
@@ -222,8 +218,170 @@ def histogram(
 
     def viewer_update(e=None):
         former_drawn_position['state'] = 'mouse-up'
-        update_display()
+        update_display(e)
     viewer.observe(viewer_update)
 
     result.update = update_display
     return result
+
+
+class _RegionHistograms():
+    """Histograms of rectangular regions of a 2D image with fixed bins over the given value range.
+
+    Small images are indexed with an integral histogram (a summed-area table per bin), so that the
+    histogram of any rectangle is computed in O(num_bins). For large images, the pre-computed bin
+    indices of the rectangle are counted instead. The integral histogram is built when the first
+    region smaller than the whole image is requested.
+    """
+    def __init__(self, image, value_range, num_bins:int=32, max_table_entries:int=16 * 1024 * 1024):
+        import numpy as np
+        image = np.asarray(image)
+        minimum, maximum = value_range
+        scale = num_bins / (maximum - minimum) if maximum > minimum else 0
+        bin_index = np.subtract(image, minimum, dtype=np.float32) * scale
+        self.bin_index = np.clip(bin_index, 0, num_bins - 1).astype(np.uint8)
+        self.num_bins = num_bins
+        self.max_table_entries = max_table_entries
+        self._table = None
+
+    @property
+    def table(self):
+        """Integral histogram of the image, or None if it would need too much memory."""
+        import numpy as np
+        height, width = self.bin_index.shape
+        if self._table is None and (height + 1) * (width + 1) * self.num_bins <= self.max_table_entries:
+            table = np.zeros((height + 1, width + 1, self.num_bins), dtype=np.int32)
+            table[1:, 1:] = self.bin_index[..., np.newaxis] == np.arange(self.num_bins, dtype=np.uint8)
+            np.cumsum(table, axis=0, out=table)
+            np.cumsum(table, axis=1, out=table)
+            self._table = table
+        return self._table
+
+    def __call__(self, x:int=0, y:int=0, width:int=None, height:int=None):
+        """Returns the number of pixels per bin in image[y:y+height, x:x+width]."""
+        import numpy as np
+        shape = self.bin_index.shape
+        y0, y1 = np.clip([y, shape[0] if height is None else y + height], 0, shape[0])
+        x0, x1 = np.clip([x, shape[1] if width is None else x + width], 0, shape[1])
+        if y1 <= y0 or x1 <= x0:
+            return np.zeros(self.num_bins, dtype=np.int64)
+        if (y1 - y0, x1 - x0) != shape and self.table is not None:
+            table = self.table
+            return table[y1, x1].astype(np.int64) - table[y0, x1] - table[y1, x0] + table[y0, x0]
+        return np.bincount(self.bin_index[y0:y1, x0:x1].ravel(), minlength=self.num_bins)
+
+
+def _histogram_to_rgb(counts, width:int=180, height:int=140, color=(31, 119, 180)):
+    """Draws a bar plot of the given counts into a white uint8 RGB image."""
+    import numpy as np
+    counts = np.asarray(counts, dtype=float)
+    bar_heights = counts / counts.max() * height if counts.max() > 0 else np.zeros_like(counts)
+    bar_of_column = np.arange(width) * len(counts) // width
+    bar_mask = np.arange(height)[:, np.newaxis] >= height - bar_heights[bar_of_column][np.newaxis, :]
+    rgb = np.full((height, width, 3), 255, dtype=np.uint8)
+    rgb[bar_mask] = color
+    return rgb
+
+
+class _RegionStatistics():
+    """Minimum, maximum, sum, mean and standard deviation of rectangular regions of a 2D image.
+
+    Sums come from summed-area tables of the intensities and their squares. Minimum and maximum
+    come from sparse tables holding the min/max of all blocks with power-of-two sizes, so that
+    any rectangle is covered by four blocks. For large images, which would need too much memory
+    for the sparse tables, min/max are computed on the cropped region instead. The tables are
+    built when the first region smaller than the whole image is requested.
+    """
+    def __init__(self, image, max_table_entries:int=16 * 1024 * 1024):
+        import numpy as np
+        self.image = np.asarray(image)
+        self.max_table_entries = max_table_entries
+        self.sums, self.square_sums = None, None
+        self.min_tables, self.max_tables = None, None
+
+    def _build_tables(self):
+        import numpy as np
+        values = self.image.astype(np.float64)
+        self.sums = _summed_area_table(values)
+        self.square_sums = _summed_area_table(values * values)
+
+        height, width = self.image.shape
+        num_levels = (int(np.log2(height)) + 1) * (int(np.log2(width)) + 1)
+        if self.image.size * num_levels <= self.max_table_entries:
+            self.min_tables = _sparse_table(self.image, np.minimum)
+            self.max_tables = _sparse_table(self.image, np.maximum)
+
+    def __call__(self, x:int=0, y:int=0, width:int=None, height:int=None):
+        """Returns a dictionary with min, max, sum, mean and std of image[y:y+height, x:x+width],
+        or None if the region is empty."""
+        import numpy as np
+        shape = self.image.shape
+        y0, y1 = (int(v) for v in np.clip([y, shape[0] if height is None else y + height], 0, shape[0]))
+        x0, x1 = (int(v) for v in np.clip([x, shape[1] if width is None else x + width], 0, shape[1]))
+        if y1 <= y0 or x1 <= x0:
+            return None
+
+        count = (y1 - y0) * (x1 - x0)
+        if (y1 - y0, x1 - x0) == shape:
+            # the whole image, no tables needed
+            values = self.image.astype(np.float64)
+            total = np.sum(values)
+            mean = total / count
+            return {'min': np.min(self.image), 'max': np.max(self.image), 'sum': total, 'mean': mean,
+                    'std': np.sqrt(max(0, np.sum(values * values) / count - mean * mean))}
+
+        if self.sums is None:
+            self._build_tables()
+        total = _rectangle_sum(self.sums, y0, y1, x0, x1)
+        mean = total / count
+        variance = max(0, _rectangle_sum(self.square_sums, y0, y1, x0, x1) / count - mean * mean)
+
+        if self.min_tables is not None:
+            minimum = _sparse_table_query(self.min_tables, np.minimum, y0, y1, x0, x1)
+            maximum = _sparse_table_query(self.max_tables, np.maximum, y0, y1, x0, x1)
+        else:
+            cropped_image = self.image[y0:y1, x0:x1]
+            minimum, maximum = np.min(cropped_image), np.max(cropped_image)
+
+        return {'min': minimum, 'max': maximum, 'sum': total, 'mean': mean, 'std': np.sqrt(variance)}
+
+
+def _summed_area_table(values):
+    import numpy as np
+    table = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=values.dtype)
+    np.cumsum(values, axis=0, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+    return table
+
+
+def _rectangle_sum(table, y0, y1, x0, x1):
+    return table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+
+
+def _sparse_table(image, reduce):
+    """tables[ky][kx][y, x] is the reduction (min or max) of image[y:y + 2**ky, x:x + 2**kx]."""
+    rows = [image]
+    while 2 ** len(rows) <= image.shape[0]:
+        half = 2 ** (len(rows) - 1)
+        rows.append(reduce(rows[-1][:-half], rows[-1][half:]))
+
+    tables = []
+    for row_table in rows:
+        columns = [row_table]
+        while 2 ** len(columns) <= image.shape[1]:
+            half = 2 ** (len(columns) - 1)
+            columns.append(reduce(columns[-1][:, :-half], columns[-1][:, half:]))
+        tables.append(columns)
+    return tables
+
+
+def _sparse_table_query(tables, reduce, y0, y1, x0, x1):
+    ky = (y1 - y0).bit_length() - 1
+    kx = (x1 - x0).bit_length() - 1
+    table = tables[ky][kx]
+    y_last, x_last = y1 - 2 ** ky, x1 - 2 ** kx
+    return reduce(reduce(table[y0, x0], table[y_last, x0]), reduce(table[y0, x_last], table[y_last, x_last]))
+
+
+def _format_number(value):
+    return "{:.4g}".format(value)
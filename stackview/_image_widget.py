@@ -1,9 +1,17 @@
 from ipycanvas import Canvas
 import numpy as np
-from ._colormaps import _labels_lut # for internal backwards compatibility
+from functools import lru_cache
+from ._colormaps import _labels_lut # noqa: F401, for internal backwards compatibility, e.g. imported by _static_view
+from ._colormaps import _colormap_lut, _labels_lut_uint8
+from ._device import _as_plane, _is_device_array, _to_host, _device_img_to_rgb
+
+# frames up to this size are sent losslessly as PNG when image_format="auto", larger ones as JPEG,
+# unless they show labels, which are always sent losslessly
+_LOSSLESS_MAX_PIXELS = 256 * 256
+
 
 class ImageWidget(Canvas):
-    def __init__(self, image, zoom_factor:float=1.0, zoom_spline_order:int=0, colormap:str=None, display_min:float=None, display_max:float=None):
+    def __init__(self, image, zoom_factor:float=1.0, zoom_spline_order:int=0, colormap:str=None, display_min:float=None, display_max:float=None, image_format:str="auto", image_quality:int=75, lossless:bool=False):
         if not ((len(image.shape) == 2) or (len(image.shape) in [3, 4] and image.shape[-1] == 3)):
             raise NotImplementedError("Only 2D images are supported" + str(image.shape))
         height = image.shape[0] * zoom_factor
@@ -14,12 +22,21 @@ class ImageWidget(Canvas):
         self.colormap = colormap
         self.display_min = display_min
         self.display_max = display_max
-        self.data = np.asarray(image)
+        self.image_format = image_format
+        self.image_quality = image_quality
+        # frames of label images are always sent losslessly; set lossless=True for e.g. label overlays
+        self.lossless = lossless
+        self._rgb_buffer = None
+        self._data_is_private = False
+        self._frame_display_range = (display_min, display_max)
+        self._last_frame = None
+        self._crosshair = None
+        self.data = image
         self.layout.stretch = False
 
     @property
     def data(self):
-        """Image data as numpy array
+        """Image data as numpy array, or as cupy array for images living on the GPU
         """
         return self._data
 
@@ -30,19 +47,161 @@ class ImageWidget(Canvas):
         if new_data is None:
             return
 
-        self._data = np.asarray(new_data)
+        self._data = _as_plane(new_data)
+        self._data_is_private = False
         self._update_image()
         self.height = self._data.shape[0] * self.zoom_factor
         self.width = self._data.shape[1] * self.zoom_factor
+        self._draw_overlay()
 
-    def _update_image(self):
-        if self.zoom_factor == 1.0:
-            self.put_image_data(_img_to_rgb(self._data, colormap=self.colormap, display_min=self.display_min, display_max=self.display_max), 0, 0)
+    @property
+    def crosshair(self):
+        """(row, column) pixel position of crosshairs drawn on top of the image, or None
+        """
+        return self._crosshair
+
+    @crosshair.setter
+    def crosshair(self, position):
+        """Move the crosshairs. The image is not re-rendered, the last frame is sent again instead.
+        """
+        if position is not None:
+            position = tuple(int(p) for p in position)
+        if position == self._crosshair:
+            return
+        self._crosshair = position
+        if self._last_frame is None:
+            self._update_image()
         else:
-            zoomed = self._zoom(self._data)
-            self.put_image_data(_img_to_rgb(zoomed, colormap=self.colormap, display_min=self.display_min, display_max=self.display_max), 0, 0)
+            from ipycanvas.canvas import COMMANDS
+            self._canvas_manager.send_draw_command(self, COMMANDS["putImageData"], [0, 0], [self._last_frame])
+        self._draw_overlay()
+
+    def _draw_overlay(self):
+        if self._crosshair is None:
+            return
+        row, column = self._crosshair
+        thickness = max(1, self.zoom_factor)
+        self.fill_style = "#%02x%02x%02x" % tuple(_colormap_lut(self.colormap)[-1])
+        self.fill_rect(0, row * self.zoom_factor, self.width, thickness)
+        self.fill_rect(column * self.zoom_factor, 0, thickness, self.height)
+
+    def update_region(self, y0:int, y1:int, x0:int, x1:int, patch):
+        """Replace the image data in the rectangle [y0:y1, x0:x1] with patch and
+        re-render and send only this part of the image.
+
+        The patch is colorized with the same display range as the rest of the image.
+        """
+        self._with_patch(y0, y1, x0, x1, patch)
+        if self.zoom_spline_order != 0:
+            self._update_image()
+            self._draw_overlay()
+            return
+
+        display_min, display_max = self._frame_display_range
+        rgb_patch = _img_to_rgb(self._data[y0:y1, x0:x1], colormap=self.colormap, display_min=display_min, display_max=display_max)
+        if self.zoom_factor != 1.0:
+            # find the zoomed pixels showing the region and pick their colours from the patch
+            rows = _zoom_indices(self._data.shape[0], self.zoom_factor)
+            columns = _zoom_indices(self._data.shape[1], self.zoom_factor)
+            zy0, zy1 = np.searchsorted(rows, [y0, y1])
+            zx0, zx1 = np.searchsorted(columns, [x0, x1])
+            if zy1 <= zy0 or zx1 <= zx0:
+                return
+            # source pixels relative to the region's start
+            rgb_patch = np.take(np.take(rgb_patch, rows[zy0:zy1] - y0, axis=0), columns[zx0:zx1] - x0, axis=1)
+            y0, x0 = zy0, zx0
+        self._put_frame(rgb_patch, int(x0), int(y0), lossless=self._requires_lossless(self._data))
+        self._last_frame = None
+        self._draw_overlay()
+
+    def _with_patch(self, y0, y1, x0, x1, patch):
+        if not self._data_is_private:
+            # never write into arrays passed in from outside
+            self._data = self._data.copy()
+            self._data_is_private = True
+        self._data[y0:y1, x0:x1] = patch
+
+    def _update_image(self):
+        frame, buffer, self._frame_display_range = self._render(self._data, out=self._rgb_buffer)
+        if buffer is not None:
+            self._rgb_buffer = buffer
+        self._last_frame = self._put_frame(frame, 0, 0, lossless=self._requires_lossless(self._data))
+
+    def _requires_lossless(self, data):
+        """True if frames showing data must not be compressed lossy, e.g. because they show label boundaries."""
+        return self.lossless or data.dtype == bool or _is_label_image(data)
+
+    def _render(self, data, out=None):
+        """Colorizes and zooms data.
+
+        Returns the frame to be shown, the colorized image in case it can be reused as `out` buffer
+        for the next frame (None otherwise) and the display range used.
+        """
+        # nearest-neighbor enlargement happens after colorization on the (smaller) uint8 image,
+        # shrinking and interpolation on the original intensities
+        enlarge_rgb = self.zoom_spline_order == 0 and self.zoom_factor > 1
+        if self.zoom_factor != 1.0 and not enlarge_rgb:
+            # interpolation happens on the host
+            data = self._zoom(_to_host(data))
+        display_min, display_max = self.display_min, self.display_max
+        if len(data.shape) == 2 and data.dtype != bool and not _is_label_image(data):
+            # remember the display range of this frame to render partial updates consistently
+            if display_min is None:
+                display_min = data.min() if not _is_device_array(data) else float(data.min())
+            if display_max is None:
+                display_max = data.max() if not _is_device_array(data) else float(data.max())
+        rgb = _img_to_rgb(data, colormap=self.colormap, display_min=display_min, display_max=display_max, out=out)
+        # never reuse arrays passed in from outside as buffer
+        buffer = rgb if rgb is not data else None
+        frame = self._zoom(rgb) if enlarge_rgb else rgb
+        return frame, buffer, (display_min, display_max)
+
+    def _render_encoded(self, data):
+        """Renders data into an encoded frame, e.g. for caching. Can be called from other threads.
+
+        Returns the encoded frame and the display range used.
+        """
+        frame, _, display_range = self._render(_as_plane(data))
+        encoded_frame = _encode_frame(frame, image_format=self.image_format, quality=self.image_quality,
+                                      lossless=self._requires_lossless(data))
+        return encoded_frame, display_range
+
+    def _show_encoded(self, data, encoded_frame, display_range):
+        """Shows a frame formerly rendered from data using _render_encoded()."""
+        self._data = _as_plane(data)
+        self._data_is_private = False
+        self._frame_display_range = display_range
+        from ipycanvas.canvas import COMMANDS
+        self._canvas_manager.send_draw_command(self, COMMANDS["putImageData"], [0, 0], [encoded_frame])
+        self._last_frame = encoded_frame
+        self.height = self._data.shape[0] * self.zoom_factor
+        self.width = self._data.shape[1] * self.zoom_factor
+        self._draw_overlay()
+
+    def _supports_encoded_frames(self):
+        # older ipycanvas versions do not allow sending pre-encoded frames
+        return hasattr(self, '_canvas_manager')
+
+    def _put_frame(self, rgb, x=0, y=0, lossless:bool=False):
+        """Encode an RGB(A) frame according to image_format/image_quality and send it as binary buffer.
+
+        Returns the encoded frame, or None if it could not be sent pre-encoded."""
+        if not self._supports_encoded_frames():
+            self.put_image_data(_to_uint8(rgb), x, y)
+            return None
+
+        image_buffer = _encode_frame(rgb, image_format=self.image_format, quality=self.image_quality, lossless=lossless)
+        from ipycanvas.canvas import COMMANDS
+        self._canvas_manager.send_draw_command(self, COMMANDS["putImageData"], [x, y], [image_buffer])
+        return image_buffer
 
     def _zoom(self, data):
+        if self.zoom_spline_order == 0:
+            # nearest-neighbor: all channels are picked in one go using cached index maps
+            rows = _zoom_indices(data.shape[0], self.zoom_factor)
+            columns = _zoom_indices(data.shape[1], self.zoom_factor)
+            return np.take(np.take(data, rows, axis=0), columns, axis=1)
+
         if len(data.shape) > 2 and data.shape[-1] == 3:
             # handle RGB images
             return np.asarray([self._zoom(data[:,:,i]) for i in range(data.shape[2])]).swapaxes(0, 2).swapaxes(1, 0)
@@ -61,6 +220,50 @@ class ImageWidget(Canvas):
         return zoomed
 
 
+@lru_cache(maxsize=16)
+def _zoom_indices(length:int, zoom_factor:float):
+    """Returns the read-only source pixel indices of a nearest-neighbor zoomed image axis.
+    These are identical to what scipy's affine_transform with order=0 and mode='nearest' samples.
+    """
+    zoomed_length = int(length * zoom_factor)
+    indices = np.minimum((np.arange(zoomed_length) / zoom_factor).astype(np.intp), length - 1)
+    indices.flags.writeable = False
+    return indices
+
+
+def _to_uint8(rgb):
+    """Converts an RGB(A) image, e.g. a float blend of two images, to uint8 without copying uint8 input."""
+    if rgb.dtype == np.uint8:
+        return rgb
+    return np.clip(rgb, 0, 255).astype(np.uint8)
+
+
+def _encode_frame(rgb, image_format:str="auto", quality:int=75, lossless:bool=False):
+    """Compresses an RGB(A) image to PNG, JPEG or WebP bytes.
+
+    With image_format="auto", small frames and frames which must be sent losslessly
+    are encoded as PNG, large frames as JPEG.
+    """
+    rgb = _to_uint8(rgb)
+    image_format = image_format.lower()
+    if image_format == "auto":
+        image_format = "png" if lossless or rgb.shape[0] * rgb.shape[1] <= _LOSSLESS_MAX_PIXELS else "jpeg"
+    if image_format not in ["png", "jpeg", "webp"]:
+        raise ValueError("Only 'auto', 'png', 'jpeg' and 'webp' image formats are supported, not " + str(image_format))
+    if image_format == "jpeg" and rgb.shape[-1] == 4:
+        rgb = rgb[..., :3]
+
+    from io import BytesIO
+    from PIL import Image
+
+    with BytesIO() as file_obj:
+        if image_format == "png":
+            Image.fromarray(rgb).save(file_obj, "PNG", compress_level=1)
+        else:
+            Image.fromarray(rgb).save(file_obj, image_format.upper(), quality=quality)
+        return file_obj.getvalue()
+
+
 def _is_label_image(image):
     return image.dtype == np.uint32 or image.dtype == np.uint64 or \
            image.dtype == np.int32 or image.dtype == np.int64
@@ -69,35 +272,103 @@ def _is_label_image(image):
 def _img_to_rgb(image,
                 colormap=None,
                 display_min=None,
-                display_max=None):
-    from ._colormaps import _labels_lut, create_colormap
+                display_max=None,
+                out=None):
+    """Turns a 2D image into a contiguous (height, width, 3) uint8 RGB image.
+
+    Intensities are mapped into the range 0..255 according to display_min/display_max and
+    the resulting indices are looked up in a precomputed colormap LUT in a single gather.
+    If `out` is given, the result is written into it, e.g. to reuse a buffer between frames.
+    Images on the GPU are colorized there and only the resulting RGB image is transferred.
+    """
+    if _is_device_array(image):
+        return _device_img_to_rgb(image, colormap=colormap, display_min=display_min, display_max=display_max)
 
     if len(image.shape) > 2 and (image.shape[-1] == 3 or image.shape[-1] == 4):
         return image
 
     if image.dtype == bool:
-        image = image * 1
+        return _labels_to_rgb(image.view(np.uint8), out=out)
 
     if _is_label_image(image):
-        lut = _labels_lut()
-        return np.asarray([lut[:, c].take(image.astype(np.int64)) for c in range(0, 3)]).swapaxes(0, 2).swapaxes(1, 0) * 255
+        return _labels_to_rgb(image, out=out)
+
+    if image.dtype.kind in 'ui' and image.dtype.itemsize <= 2:
+        # 8/16-bit images: every possible pixel value has a precomputed colour
+        if display_min is None:
+            display_min = image.min()
+        if display_max is None:
+            display_max = image.max()
+        lut = _integer_lut(image.dtype.str, float(display_min), float(display_max), colormap)
+        return _apply_lut(lut, image.view(image.dtype.str.replace('i', 'u')), out=out)
+
+    indices = _intensity_to_index(image, display_min, display_max)
+    return _apply_lut(_colormap_lut(colormap), indices, out=out)
+
+
+def _img_to_indexed(image, colormap=None, display_min=None, display_max=None):
+    """Turns a 2D intensity image into uint8 indices into the colormap LUT, so that
+    lut[indices] equals _img_to_rgb(image, ...).
+
+    Returns indices and the (256, 3) LUT, or None for RGB, binary and label images.
+    """
+    if len(image.shape) != 2 or image.dtype == bool or _is_label_image(image):
+        return None
+    return _intensity_to_index(image, display_min, display_max), _colormap_lut(colormap)
+
 
+def _labels_to_rgb(labels, out=None):
+    """Turns a 2D label image into a contiguous (height, width, 3) uint8 RGB image.
+
+    Label IDs beyond the size of the label LUT wrap around, so that images with millions
+    of objects render in random colours without allocating a LUT per label.
+    Background (0) stays black.
+    """
+    if labels.dtype.kind not in 'ui':
+        # e.g. float images containing label IDs
+        labels = labels.astype(np.uint64)
+    num_colors = len(_labels_lut_uint8())
+    if labels.dtype.kind == 'u' and labels.dtype.itemsize <= 2 or labels.max() < num_colors:
+        indices = labels
+    else:
+        indices = np.remainder(labels - 1, num_colors - 1) + 1
+        indices[labels == 0] = 0
+    return _apply_lut(_labels_lut_uint8(), indices, out=out)
+
+
+@lru_cache(maxsize=16)
+def _integer_lut(dtype, display_min, display_max, colormap=None):
+    """Returns a read-only (256, 3) or (65536, 3) uint8 LUT for 8/16-bit images of the given dtype.
+    The LUT is meant to be indexed with the unsigned view of an image, so that signed images work, too.
+    """
+    dtype = np.dtype(dtype)
+    unsigned_dtype = np.dtype(dtype.str.replace('i', 'u'))
+    values = np.arange(2 ** (8 * dtype.itemsize), dtype=unsigned_dtype).view(dtype)
+    lut = _apply_lut(_colormap_lut(colormap), _intensity_to_index(values, display_min, display_max))
+    lut.flags.writeable = False
+    return lut
+
+
+def _intensity_to_index(image, display_min=None, display_max=None):
+    """Maps intensities to uint8 LUT indices, clipping values outside the display range."""
     if display_min is None:
         display_min = image.min()
     if display_max is None:
         display_max = image.max()
 
-    diplay_range_width = (display_max - display_min)
-    if diplay_range_width == 0:
-        diplay_range_width = 1
+    display_range_width = (display_max - display_min)
+    if display_range_width == 0:
+        display_range_width = 1
 
-    image = ((image.astype(float) - display_min) / diplay_range_width * 255).astype(np.uint8)
+    # a single floating point buffer is reused for all arithmetic steps
+    buffer = np.subtract(image, display_min, dtype=np.result_type(image.dtype, np.float32))
+    np.multiply(buffer, 255 / display_range_width, out=buffer)
+    np.clip(buffer, 0, 255, out=buffer)
+    return buffer.astype(np.uint8)
 
-    image = np.minimum(image, 255)
-    image = np.maximum(image, 0)
 
-    if colormap is None:
-        return (np.asarray([image, image, image]).swapaxes(0, 2).swapaxes(1, 0)).astype(np.uint8)
-    else:
-        lut = np.asarray(create_colormap(colormap).colors)
-        return (np.asarray([lut[:, c].take(image.astype(int)) for c in range(0, 3)]).swapaxes(0, 2).swapaxes(1, 0) * 255).astype(np.uint8)
+def _apply_lut(lut, indices, out=None):
+    """Looks up indices in a (n, channels) LUT, resulting in a (height, width, channels) image."""
+    if out is not None and (out.shape != indices.shape + lut.shape[1:] or out.dtype != lut.dtype):
+        out = None
+    return np.take(lut, indices, axis=0, out=out, mode='clip')
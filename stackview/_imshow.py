@@ -65,10 +65,8 @@ def imshow(image,
     while len(image.shape) > 2 and image.shape[-1] not in [3, 4]: #[3,4]: RGB, RGBA
         image = image.max(axis=0)
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
-
-    image = np.asarray(image)
+    from ._arrays import _to_numpy
+    image = _to_numpy(image)
     if len(image.shape) == 1:
         image = image[np.newaxis]
 
@@ -48,9 +48,9 @@ def interact(func,
     from ._utilities import _no_resize
     from ._slice_viewer import _SliceViewer
     from ._utilities import SliderWithButtons
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
+    image = _as_array(image, device=False)
 
 
     # hidden feature: func can be a tuple of (function, alias_name)
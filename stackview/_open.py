@@ -0,0 +1,150 @@
+import numpy as np
+
+
+def open(filename: str,
+         cache_size_mb: float = 256,
+         **kwargs):
+    """Opens an image file without loading it into memory and shows it with a slider to go through the stack.
+    Only the planes under the current slider position are read from disk.
+
+    Parameters
+    ----------
+    filename : str
+        .npy files are memory-mapped, TIFF files are read page by page and zarr stores chunk by chunk.
+        Other file formats are loaded into memory completely using imageio.
+    cache_size_mb: float, optional
+        Maximum size of the recently read TIFF pages / zarr planes kept in memory
+    kwargs
+        Additional parameters passed to slice(), e.g. zoom_factor, colormap, display_min, display_max
+
+    Returns
+    -------
+    An ipywidget with an image display and a slider. The opened image is accessible as `result.viewer.image`.
+
+    See Also
+    --------
+    slice()
+    """
+    from ._slice import slice
+
+    image = _open_lazy(filename, cache_size_mb=cache_size_mb)
+    return slice(image, **kwargs)
+
+
+def _open_lazy(filename, cache_size_mb: float = 256):
+    """Returns an array-like object which reads data from the file when it is indexed."""
+    import os
+    max_bytes = int(cache_size_mb * 1024 * 1024)
+    extension = os.path.splitext(str(filename).rstrip("/\\"))[1].lower()
+
+    if extension == ".npy":
+        return np.load(filename, mmap_mode='r')
+
+    if extension in [".tif", ".tiff"]:
+        import tifffile
+        tiff_file = tifffile.TiffFile(filename)
+        series = tiff_file.series[0]
+        page_shape = series.keyframe.shape
+
+        # leading dimensions of the series enumerate pages
+        num_page_dimensions = len(series.shape)
+        while num_page_dimensions > 0 and np.prod(series.shape[num_page_dimensions - 1:]) <= np.prod(page_shape):
+            num_page_dimensions -= 1
+        plane_shape = series.shape[num_page_dimensions:]
+        pages_shape = series.shape[:num_page_dimensions]
+
+        def read_plane(index):
+            page_number = int(np.ravel_multi_index(index, pages_shape)) if len(index) > 0 else 0
+            return series.pages[page_number].asarray().reshape(plane_shape)
+
+        return _LazyImage(series.shape, series.dtype, read_plane, len(plane_shape), max_bytes, file_handle=tiff_file)
+
+    if extension == ".zarr":
+        import zarr
+        store = zarr.open(filename, mode='r')
+        if hasattr(store, 'shape'):
+            arrays = [store]
+        else:
+            # groups, e.g. OME-zarr multiscale images, are interpreted as image pyramid
+            arrays = sorted([a for _, a in store.arrays()], key=lambda a: -np.prod(a.shape))
+        pyramid = [_LazyImage(a.shape, a.dtype, a.__getitem__, _plane_ndim(a.shape), max_bytes) for a in arrays]
+        return pyramid[0] if len(pyramid) == 1 else pyramid
+
+    import imageio
+    return imageio.imread(filename)
+
+
+def _plane_ndim(shape):
+    """Number of dimensions of a 2D plane, including the channel axis of RGB(A) images"""
+    if len(shape) > 2 and shape[-1] in [3, 4]:
+        return 3
+    return min(2, len(shape))
+
+
+class _LazyImage():
+    """
+    Numpy-array-like access to an image which is read plane by plane on demand.
+    Recently read planes are kept in an LRU cache.
+
+    Planes are read one after another, also when requested from several threads (e.g. when
+    prefetching), because file readers such as tifffile.TiffFile are not thread-safe.
+    The file handle, if given, is closed by close() or when the image is garbage collected.
+    """
+    def __init__(self, shape, dtype, read_plane, plane_ndim: int, max_cache_bytes: int, file_handle=None):
+        import threading
+        import weakref
+        from ._utilities import _LRUCache
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.ndim = len(self.shape)
+        self._read_plane = read_plane
+        self._plane_ndim = plane_ndim
+        self._cache = _LRUCache(max_cache_bytes)
+        self._lock = threading.Lock()
+        self._file_handle = file_handle
+        self._finalizer = weakref.finalize(self, file_handle.close) if file_handle is not None else None
+
+    def close(self):
+        """Closes the underlying file."""
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def _plane(self, index):
+        with self._lock:
+            plane = self._cache.get(index)
+            if plane is None:
+                plane = np.asarray(self._read_plane(index))
+                self._cache[index] = plane
+            return plane
+
+    def __getitem__(self, index):
+        if not isinstance(index, tuple):
+            index = (index,)
+        if any(i is Ellipsis for i in index):
+            position = [i is Ellipsis for i in index].index(True)
+            fill = (slice(None),) * (self.ndim - len(index) + 1)
+            index = index[:position] + fill + index[position + 1:]
+        index = index + (slice(None),) * (self.ndim - len(index))
+
+        num_stack_dimensions = self.ndim - self._plane_ndim
+        stack_index = index[:num_stack_dimensions]
+        plane_index = index[num_stack_dimensions:]
+
+        if all(isinstance(i, (int, np.integer)) for i in stack_index):
+            stack_index = tuple(int(i) % s for i, s in zip(stack_index, self.shape))
+            return self._plane(stack_index)[plane_index]
+
+        # read all planes that are needed, e.g. for cropping
+        plane_numbers = np.arange(int(np.prod(self.shape[:num_stack_dimensions]))).reshape(self.shape[:num_stack_dimensions])[stack_index]
+        planes = [self._plane(tuple(int(i) for i in np.unravel_index(n, self.shape[:num_stack_dimensions]))) for n in plane_numbers.ravel()]
+        result = np.asarray(planes).reshape(plane_numbers.shape + self.shape[num_stack_dimensions:])
+        return result[(slice(None),) * plane_numbers.ndim + plane_index]
+
+    def __array__(self, dtype=None, copy=None):
+        result = self[...]
+        if dtype is not None:
+            result = result.astype(dtype)
+        return result
+
+    def __len__(self):
+        return self.shape[0]
@@ -1,7 +1,5 @@
 import warnings
 
-import numpy as np
-
 
 def orthogonal(
         image,
@@ -14,6 +12,7 @@ def orthogonal(
         display_min:float = None,
         display_max:float = None,
         crosshairs:bool = True,
+        linked_cursor:bool = False,
 ):
     """Show three viewers slicing the image stack in Z,Y and X.
 
@@ -39,6 +38,8 @@ def orthogonal(
         Upper bound of properly shown intensities
     crosshairs: bool, optional
         Show crosshairs in the image corresponding to the slice position
+    linked_cursor: bool, optional
+        Clicking into one of the views moves the other two views to the clicked position
 
     Returns
     -------
@@ -50,65 +51,66 @@ def orthogonal(
     """
     import ipywidgets
     from ._slice import slice
+    from ._image_widget import _is_label_image
+    from ._arrays import _ArrayHandle
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
-
-    if len(image.shape) != 3:
+    handle = _ArrayHandle(image)
+    if len(handle.shape) != 3:
         warnings.warn("Orthogonal views are only supported for 3D images. Consider using slice() instead.")
 
+    if not _is_label_image(handle):
+        # all views share one display range, which is determined once
+        if display_min is None or display_max is None:
+            statistics = handle.stats()
+        if display_min is None:
+            display_min = float(statistics.min)
+        if display_max is None:
+            display_max = float(statistics.max)
+
+    # swapping axes works on the array of any backend without copying; images on the GPU stay there
+    image = handle.array
+
     widgets = [
         slice(image, slider_text="Z", continuous_update=continuous_update, zoom_factor=zoom_factor, zoom_spline_order=zoom_spline_order, colormap=colormap, display_min=display_min, display_max=display_max),
         slice(image.swapaxes(-3,-2).swapaxes(-2,-1), slider_text="Y", continuous_update=continuous_update, zoom_factor=zoom_factor, zoom_spline_order=zoom_spline_order, colormap=colormap, display_min=display_min, display_max=display_max),
         slice(image.swapaxes(-3,-1), slider_text="X", continuous_update=continuous_update, zoom_factor=zoom_factor, zoom_spline_order=zoom_spline_order, colormap=colormap, display_min=display_min, display_max=display_max),
     ]
+    viewers = [widget.viewer for widget in widgets]
+
+    # for each view, the viewers whose slice positions correspond to its rows and columns
+    row_viewer = [1, 2, 1]
+    column_viewer = [2, 0, 0]
 
     def update(event=None):
         for widget in widgets:
             widget.update()
 
-
+    # each view re-renders only when its own slider moves; in the other views, only the crosshairs move
     if crosshairs:
-        def redraw0(event=None):
-            image = np.copy(widgets[0].viewer.get_view_slice())
-            y = widgets[1].viewer.get_slice_index()[-1]
-            x = widgets[2].viewer.get_slice_index()[-1]
-            image[y,:] = image.max()
-            image[:,x] = image.max()
-            widgets[0].viewer.view.data = image
-
-        def redraw1(event=None):
-            image = np.copy(widgets[1].viewer.get_view_slice())
-            y = widgets[2].viewer.get_slice_index()[-1]
-            x = widgets[0].viewer.get_slice_index()[-1]
-            image[y, :] = image.max()
-            image[:, x] = image.max()
-            widgets[1].viewer.view.data = image
-
-
-        def redraw2(event=None):
-            image = np.copy(widgets[2].viewer.get_view_slice())
-            y = widgets[1].viewer.get_slice_index()[-1]
-            x = widgets[0].viewer.get_slice_index()[-1]
-            image[y, :] = image.max()
-            image[:, x] = image.max()
-            widgets[2].viewer.view.data = image
-    
-        widgets[0].viewer.observe(redraw0)
-        widgets[0].viewer.observe(redraw1)
-        widgets[0].viewer.observe(redraw2)
-
-        widgets[1].viewer.observe(redraw0)
-        widgets[1].viewer.observe(redraw1)
-        widgets[1].viewer.observe(redraw2)
-
-        widgets[2].viewer.observe(redraw0)
-        widgets[2].viewer.observe(redraw1)
-        widgets[2].viewer.observe(redraw2)
-
-        redraw0()
-        redraw1()
-        redraw2()
+        def update_crosshairs(event=None):
+            position = [viewer.get_slice_index()[-1] for viewer in viewers]
+            for viewer, r, c in zip(viewers, row_viewer, column_viewer):
+                viewer.view.crosshair = (position[r], position[c])
+
+        for viewer in viewers:
+            viewer.sliders[-1].observe(viewer._schedule(update_crosshairs))
+        update_crosshairs()
+
+    if linked_cursor:
+        from ipyevents import Event
+
+        def move_to_clicked_position(view, r, c):
+            def clicked(event):
+                row = int(event['relativeY'] / zoom_factor)
+                column = int(event['relativeX'] / zoom_factor)
+                if 0 <= row < view.data.shape[0] and 0 <= column < view.data.shape[1]:
+                    viewers[r].sliders[-1]._set_value(row)
+                    viewers[c].sliders[-1]._set_value(column)
+            return clicked
+
+        for viewer, r, c in zip(viewers, row_viewer, column_viewer):
+            event_handler = Event(source=viewer.view, watched_events=['click'])
+            event_handler.on_dom_event(move_to_clicked_position(viewer.view, r, c))
 
     widgets[1].layout=ipywidgets.Layout(margin='0 5px 0 5px')
 
@@ -47,9 +47,9 @@ def picker(
     import ipywidgets
     from ._slice_viewer import _SliceViewer
     from ._utilities import _no_resize
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
+    image = _as_array(image, device=False)
 
     viewer = _SliceViewer(image,
                           slice_number=slice_number,
@@ -55,12 +55,10 @@ def side_by_side(
     from ._image_widget import ImageWidget
     import numpy as np
     from ._utilities import _no_resize
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image1)):
-        image1 = image1.get()
-
-    if 'cupy.ndarray' in str(type(image2)):
-        image2 = image2.get()
+    image1 = _as_array(image1, device=False)
+    image2 = _as_array(image2, device=False)
 
     viewer = _SliceViewer(image1, zoom_factor=zoom_factor, zoom_spline_order=zoom_spline_order, continuous_update=continuous_update, slider_text=slider_text, slice_number=slice_number)
     view1 = viewer.view #ImageWidget(slice_image, zoom_factor=zoom_factor, zoom_spline_order=zoom_spline_order)
@@ -69,6 +67,8 @@ def side_by_side(
 
     # setup user interface for changing the slice
     from ._image_widget import _is_label_image, _img_to_rgb
+    from ._compositing import _Compositor
+    compositor = _Compositor()
 
     # event handler when the user changed something:
     def configuration_updated(event=None):
@@ -82,19 +82,15 @@ def side_by_side(
             if _is_label_image(slice_image1) and _is_label_image(slice_image2):
                 warnings.warn("Side-by-side mixing two label images may look weird." +
                               "Consider showing original image and a label image side-by-side.")
-                factor1 = 0.5
                 factor2 = 0.5
             elif _is_label_image(slice_image1):
-                factor1 = 0.3
                 factor2 = 0.7
             elif _is_label_image(slice_image2):
-                factor1 = 0.7
                 factor2 = 0.3
             else:
-                factor1 = 0.5
                 factor2 = 0.5
 
-            rgb_mix = factor1 * rgb_image1 + factor2 * rgb_image2
+            rgb_mix = compositor.composite([rgb_image1, rgb_image2], alphas=[1, factor2])
 
             view1.data = rgb_image1
             view2.data = rgb_image2
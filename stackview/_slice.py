@@ -10,14 +10,19 @@ def slice(
         zoom_spline_order:int = 0,
         colormap:str = None,
         display_min:float = None,
-        display_max:float = None
+        display_max:float = None,
+        multiscale:bool = False,
+        max_fps:float = 30,
+        async_rendering:bool = False,
+        display_range:str = None
 ):
     """Shows an image with a slider to go through a stack.
 
     Parameters
     ----------
-    image : image
-        Image shown
+    image : image or list of images
+        Image shown. A list of images is interpreted as image pyramid: the full resolution image
+        first, followed by versions downsampled in Y and X. The level matching the zoom_factor is shown.
     slice_number : int, optional
         Slice-position in the stack
     axis : int, optional
@@ -40,6 +45,15 @@ def slice(
         Lower bound of properly shown intensities
     display_max: float, optional
         Upper bound of properly shown intensities
+    multiscale: bool, optional
+        Show downsampled views of the image when zoom_factor < 1 instead of reading full resolution slices
+    max_fps: float, optional
+        Maximum number of frames per second shown while dragging the slider; intermediate positions are skipped
+    async_rendering: bool, optional
+        Render slices in a background thread while dragging the slider, so that the notebook stays responsive
+    display_range: str, optional
+        If "auto", display_min and display_max default to the 0.1 and 99.9 percentiles of the intensities
+        of the whole stack, estimated from a sample, instead of the minimum and maximum of the shown slice
 
     Returns
     -------
@@ -48,9 +62,6 @@ def slice(
     from ._utilities import _no_resize
     from ._slice_viewer import _SliceViewer
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
-
     import ipywidgets
     viewer = _SliceViewer(image,
         slice_number,
@@ -63,7 +74,11 @@ def slice(
         zoom_spline_order=zoom_spline_order,
         colormap=colormap,
         display_min=display_min,
-        display_max=display_max
+        display_max=display_max,
+        multiscale=multiscale,
+        max_fps=max_fps,
+        async_rendering=async_rendering,
+        display_range=display_range
     )
     view = viewer.view
     slice_slider = viewer.slice_slider
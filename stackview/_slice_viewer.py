@@ -1,7 +1,11 @@
 import warnings
+from functools import lru_cache
 
 import numpy as np
 
+from ._arrays import _ArrayHandle, _is_mutable
+from ._device import _is_device_array
+
 class _SliceViewer():
     def __init__(self,
                  image,
@@ -16,13 +20,37 @@ class _SliceViewer():
                  colormap:str = None,
                  display_min:float = None,
                  display_max:float = None,
+                 multiscale:bool = False,
+                 frame_cache_mb:float = None,
+                 prefetch:int = None,
+                 max_fps:float = 30,
+                 async_rendering:bool = False,
+                 display_range:str = None,
                  ):
         import ipywidgets
         from ._image_widget import ImageWidget
         from ._uint_field import intSlider
+        from ._utilities import _LRUCache
         self.update_active = True
 
+        if frame_cache_mb is None:
+            # frames of arrays which may be modified in place could be outdated when shown again
+            frame_cache_mb = 0 if _is_mutable(image[0] if isinstance(image, (list, tuple)) else image) else 64
+        # rendered frames of recently shown slices, and neighboring slices rendered in the background
+        self._frame_cache = _LRUCache(int(frame_cache_mb * 1024 * 1024))
+        self._frame_generation = 0
+        self._prefetch_futures = []
+        self.prefetch = prefetch
+        self.max_fps = max_fps
+        self._schedulers = []
+        # render frames requested by slider events in a background thread, while the kernel stays responsive
+        self.async_rendering = async_rendering
+        self._render_future = None
+
+        self.zoom_factor = zoom_factor
+        self.multiscale = multiscale
         self.image = image
+        image = self.image
 
         if slice_number is None:
             slice_number = [int(s / 2) for s in image.shape[:-2]]
@@ -46,11 +74,23 @@ class _SliceViewer():
             )
             slider.layout.width = '100%'  # Make the slider full-width
 
-            slider.observe(self.update)
+            slider.observe(self._schedule(self.update))
             self.sliders.append(slider)
 
-        self.view = ImageWidget(self.get_view_slice(),
-                                zoom_factor=zoom_factor,
+        if display_range == "auto":
+            from ._image_widget import _is_label_image
+            from ._statistics import _auto_display_range
+            if not _is_label_image(self.image) and (display_min is None or display_max is None):
+                # the same display range for all slices, estimated from a sample of the whole stack
+                auto_min, auto_max = _auto_display_range(self.image)
+                display_min = auto_min if display_min is None else display_min
+                display_max = auto_max if display_max is None else display_max
+        elif display_range is not None:
+            raise ValueError("display_range must be None or 'auto', got " + str(display_range))
+
+        level, level_zoom_factor = self._display_level()
+        self.view = ImageWidget(self.get_view_slice(self._pyramid[level]),
+                                zoom_factor=level_zoom_factor,
                                 zoom_spline_order=zoom_spline_order,
                                 colormap=colormap,
                                 display_min=display_min,
@@ -61,6 +101,42 @@ class _SliceViewer():
         self.slice_slider = ipywidgets.VBox(self.sliders[::-1])
         self.update()
 
+    @property
+    def image(self):
+        """Image shown in full resolution"""
+        return self._pyramid[0].array
+
+    @image.setter
+    def image(self, image):
+        """Set the image to be shown. A list of images is interpreted as image pyramid
+        with the full resolution image first and downsampled versions of it afterwards.
+        """
+        if isinstance(image, (list, tuple)):
+            self._pyramid = [_ArrayHandle(level) for level in image]
+        elif self.multiscale:
+            self._pyramid = [_ArrayHandle(level) for level in _stride_pyramid(_ArrayHandle(image).array, self.zoom_factor)]
+        else:
+            self._pyramid = [_ArrayHandle(image)]
+        self._invalidate_frames()
+
+    def _invalidate_frames(self):
+        for future in self._prefetch_futures:
+            future.cancel()
+        self._prefetch_futures = []
+        # frames rendered by prefetching which is still running are stored under the old generation
+        self._frame_generation += 1
+        self._frame_cache.clear()
+
+    def _display_level(self):
+        """Returns the index of the smallest pyramid level that still has at least the resolution
+        shown on screen, together with the zoom factor that remains to be applied to it."""
+        axis = -3 if self.image.shape[-1] in [3, 4] and len(self.image.shape) > 2 else -2
+        for level in range(len(self._pyramid) - 1, 0, -1):
+            scale = self._pyramid[level].shape[axis] / self.image.shape[axis]
+            if scale >= self.zoom_factor:
+                return level, self.zoom_factor / scale
+        return 0, self.zoom_factor
+
     def set_image(self, image):
         for i, s in enumerate(self.sliders):
             s._set_value_min_max(int(image.shape[i] / 2), 0, image.shape[i] - 1)
@@ -68,24 +144,198 @@ class _SliceViewer():
 
     def observe(self, x):
         self.update_active = False
+        scheduled_x = self._schedule(x)
         for s in self.sliders:
-            s.observe(x)
+            s.observe(scheduled_x)
+
+    def _schedule(self, function):
+        scheduler = _FrameScheduler(function, lambda: self.max_fps)
+        self._schedulers.append(scheduler)
+        return scheduler.request
+
+    @property
+    def rendering(self):
+        """True while a frame is being rendered or scheduled to be rendered"""
+        return self._render_future is not None or any([scheduler.busy for scheduler in self._schedulers])
 
     # event handler when the user changed something:
     def update(self, event=None):
-        if self.update_active:
-            self.view.data = self.get_view_slice()
+        if not self.update_active:
+            return
+        if event is None:
+            # explicit updates, e.g. after modifying the image or the view settings, render from scratch
+            self._invalidate_frames()
+
+        level = 0
+        if len(self._pyramid) > 1:
+            level, self.view.zoom_factor = self._display_level()
+
+        loop = _running_loop() if self.async_rendering and event is not None else None
+        if not self.view._supports_encoded_frames() or (self._frame_cache.max_bytes == 0 and loop is None):
+            self.view.data = self.get_view_slice(self._pyramid[level])
+            return
+
+        index = tuple(self.get_slice_index())
+        frame = self._frame_cache.get(self._frame_key(index, level))
+        if frame is None and loop is not None:
+            self._render_in_background(index, level, loop)
+            return
+        if frame is None:
+            frame = self._render_frame(index, level)
+        self._show_frame(frame, index, level)
+
+    def _show_frame(self, frame, index, level):
+        self._cancel_background_rendering()
+        self.view._show_encoded(*frame)
+        self._prefetch_neighbors(index, level)
+
+    def _render_in_background(self, index, level, loop):
+        """Renders the slice in a worker thread and shows it once done, unless another
+        slice was requested in the meantime."""
+        self._cancel_background_rendering()
+        future = _render_executor().submit(self._render_frame, index, level)
+        self._render_future = future
+
+        def show(future):
+            if future is not self._render_future:
+                return # superseded
+            self._render_future = None
+            self._show_frame(future.result(), index, level)
+
+        future.add_done_callback(lambda future: future.cancelled() or loop.call_soon_threadsafe(show, future))
+
+    def _cancel_background_rendering(self):
+        if self._render_future is not None:
+            self._render_future.cancel()
+            self._render_future = None
+
+    def _frame_key(self, index, level):
+        view = self.view
+        return (self._frame_generation, index, level, view.zoom_factor, view.zoom_spline_order, view.colormap,
+                view.display_min, view.display_max, view.image_format, view.image_quality, view.lossless)
+
+    def _render_frame(self, index, level):
+        """Renders the slice at the given index and stores it in the frame cache."""
+        key = self._frame_key(index, level)
+        data = self._pyramid[level].get_plane(index)
+        encoded_frame, display_range = self.view._render_encoded(data)
+        frame = (data, encoded_frame, display_range)
+        self._frame_cache[key] = frame
+        return frame
+
+    def _prefetch_neighbors(self, index, level):
+        """Renders the slices next to the current one in the background, closest ones first."""
+        for future in self._prefetch_futures:
+            future.cancel()
+        self._prefetch_futures = []
+
+        prefetch = self.prefetch
+        if self._frame_cache.max_bytes == 0:
+            # prefetched frames could not be kept
+            prefetch = 0
+        elif prefetch is None:
+            # reading slices from (GPU) memory is fast anyway, but lazy arrays profit from reading ahead
+            prefetch = 0 if isinstance(self.image, np.ndarray) or _is_device_array(self.image) else 2
+
+        for offset in range(1, prefetch + 1):
+            for d in range(len(index)):
+                for neighbor_position in [index[d] + offset, index[d] - offset]:
+                    if 0 <= neighbor_position < self.image.shape[d]:
+                        neighbor = index[:d] + (neighbor_position,) + index[d + 1:]
+                        if self._frame_key(neighbor, level) not in self._frame_cache:
+                            self._prefetch_futures.append(_prefetch_executor().submit(self._render_frame, neighbor, level))
 
     def configuration_updated(self, event=None):
         warnings.warn('SliceViewer.configuration_updated is deprecated, use SliceViewer.update instead.')
         return self.update(event)
 
     def get_view_slice(self, data=None):
+        """Returns the currently shown plane of the image, or of another image (or pyramid level) of the same shape."""
         if data is None:
-            data = self.image
-        for d, slider in enumerate(self.sliders):
-            data = np.take(data, slider.value, axis=0)
-        return data
+            data = self._pyramid[0]
+        if not isinstance(data, _ArrayHandle):
+            data = _ArrayHandle(data)
+        return data.get_plane(self.get_slice_index())
 
     def get_slice_index(self):
         return [s.value for s in self.sliders]
+
+
+def _stride_pyramid(image, zoom_factor):
+    """Returns a list of strided views of the image, each downsampled by a factor of 2
+    in Y and X compared to the former, down to the resolution needed for the given zoom factor."""
+    pyramid = [image]
+    is_rgb = image.shape[-1] in [3, 4] and len(image.shape) > 2
+    stride = 2
+    while 1 / stride >= zoom_factor:
+        if is_rgb:
+            level = image[..., ::stride, ::stride, :]
+        else:
+            level = image[..., ::stride, ::stride]
+        pyramid.append(level)
+        stride = stride * 2
+    return pyramid
+
+
+@lru_cache(maxsize=1)
+def _render_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="stackview-render")
+
+
+@lru_cache(maxsize=1)
+def _prefetch_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="stackview-prefetch")
+
+
+def _running_loop():
+    """Returns the event loop running in this thread (e.g. the Jupyter kernel's) or None."""
+    import asyncio
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _FrameScheduler():
+    """
+    Coalesces slider events: If events arrive while a frame is rendered or the
+    maximum frame rate is reached, only the latest state is rendered afterwards.
+    Outside a running event loop (e.g. in scripts), events are handled immediately.
+    """
+    def __init__(self, render, max_fps):
+        self._render = render
+        self._max_fps = max_fps
+        self._pending_event = None
+        self._last_render_time = 0
+        self.busy = False
+
+    def request(self, event=None):
+        import time
+        loop = _running_loop()
+
+        self._pending_event = event
+        if loop is None:
+            self._render_pending()
+            return
+        if self.busy:
+            # the scheduled frame will show the state of the latest event
+            return
+
+        self.busy = True
+        max_fps = self._max_fps()
+        min_interval = 1 / max_fps if max_fps else 0
+        delay = max(0, self._last_render_time + min_interval - time.monotonic())
+        loop.call_later(delay, self._render_pending)
+
+    def _render_pending(self):
+        import time
+        event = self._pending_event
+        self._pending_event = None
+        self.busy = True
+        try:
+            self._render(event)
+        finally:
+            self.busy = False
+            self._last_render_time = time.monotonic()
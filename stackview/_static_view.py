@@ -7,6 +7,8 @@ def insight(image, library_name=None, help_url=None):
     """
     Converts a numpy-array-like image to numpy-compatible array with a convenient display in Jupyter notebooks
     including shape, min/max intensity, histogram and viewing 32-bit and 64-bit integer images as coloured labels.
+    Numpy arrays are not copied: the result shares memory with the given image, so modifying
+    the result modifies the image and vice versa. Use insight(image.copy()) for an independent array.
     """
     return StackViewNDArray(image, library_name, help_url)
 
@@ -35,13 +37,11 @@ def jupyter_displayable_output(
 class StackViewNDArray(np.ndarray):
 
     def __new__(cls, input_array, library_name=None, help_url=None):
-        if 'cupy.ndarray' in str(type(input_array)):
-            input_array = input_array.get()
-        input_array = np.asarray(input_array)
-        obj = super(StackViewNDArray, cls).__new__(cls, shape=input_array.shape, dtype=input_array.dtype)
+        from ._arrays import _to_numpy
+        # a view sharing memory with the input, numpy arrays are not copied
+        obj = _to_numpy(input_array).view(cls)
         obj.library_name = library_name
         obj.help_url = help_url
-        obj[:] = input_array
         return obj
 
     def __array_finalize__(self, obj):
@@ -73,6 +73,7 @@ class StackViewNDArray(np.ndarray):
         size_in_bytes = size_in_pixels * self.dtype.itemsize
 
         from ._image_widget import _is_label_image
+        from ._statistics import _image_statistics
         labels = _is_label_image(self)
 
         import matplotlib.pyplot as plt
@@ -100,11 +101,12 @@ class StackViewNDArray(np.ndarray):
         histogram = ""
 
         if size_in_bytes < 100 * 1024 * 1024:
+            statistics = _image_statistics(self)
             if not labels:
                 import numpy as np
 
                 num_bins = 32
-                h, _ = np.histogram(self, bins=num_bins)
+                h, _ = statistics.histogram(num_bins)
 
                 plt.figure(figsize=(1.8, 1.2))
                 plt.bar(range(0, len(h)), h)
@@ -119,8 +121,8 @@ class StackViewNDArray(np.ndarray):
 
                 histogram = _png_to_html(_plt_to_png())
 
-            min_intensity = self.min()
-            max_intensity = self.max()
+            min_intensity = statistics.min
+            max_intensity = statistics.max
             min_max = "<tr><td>min</td><td>" + str(min_intensity) + "</td></tr>" + \
                       "<tr><td>max</td><td>" + str(max_intensity) + "</td></tr>"
 
@@ -0,0 +1,196 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from ._arrays import _is_mutable, _to_numpy
+
+# number of histogram bins for images which are not 8/16-bit integer
+_NUM_BINS = 1024
+# number of pixels processed at once, so that large and lazy images are never loaded completely
+_CHUNK_PIXELS = 16 * 1024 * 1024
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 32
+# size of strided samples: number of planes and pixels along Y and X
+_SAMPLE_PLANES = 16
+_SAMPLE_SIZE = 256
+
+
+class _ImageStatistics():
+    """Minimum, maximum and a coarse histogram of all pixels of an image.
+
+    Minimum and maximum are determined right away, the histogram is computed the first time
+    it is needed, e.g. by percentile() or histogram().
+    """
+
+    def __init__(self, minimum, maximum, image=None):
+        self.min = minimum
+        self.max = maximum
+        self._counts = None
+        self._bin_edges = None
+        self._set_source(image)
+
+    def _set_source(self, image, weak:bool=False):
+        """Refers to the image the histogram is computed from. Cached statistics refer to it weakly,
+        so that they do not keep images alive."""
+        try:
+            self._source = weakref.ref(image) if weak else (lambda: image)
+        except TypeError:
+            self._source = lambda: image
+
+    @property
+    def counts(self):
+        if self._counts is None:
+            self._counts, self._bin_edges = _compute_histogram(self._source(), self.min, self.max)
+        return self._counts
+
+    @property
+    def bin_edges(self):
+        self.counts
+        return self._bin_edges
+
+    def percentile(self, q):
+        """Estimates the q-th percentile (0..100) from the histogram."""
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        if cumulative[-1] == 0:
+            return self.min
+        value = np.interp(np.asarray(q) / 100 * cumulative[-1], cumulative, self.bin_edges)
+        return np.clip(value, float(self.min), float(self.max))
+
+    def histogram(self, bins:int):
+        """Returns a histogram with the given number of bins between min and max, like np.histogram."""
+        value_range = (float(self.min), float(self.max))
+        centers = (self.bin_edges[:-1] + self.bin_edges[1:]) / 2
+        return np.histogram(np.clip(centers, *value_range), bins=bins, range=value_range, weights=self.counts)
+
+
+def _image_statistics(image, sample:bool=False):
+    """Returns the _ImageStatistics of an image, computed in chunks.
+
+    Statistics of read-only and lazy images (memory-mapped files, dask, zarr, ...) are cached
+    and shared between all widgets showing the same image. Read-only arrays are identified by
+    their memory buffer, shape, strides and dtype, other images by their identity. Writeable
+    in-memory arrays may be modified in place at any time, their statistics are computed anew.
+
+    With sample=True, the statistics are estimated from a strided sample of the image,
+    which reads only a few planes of large or lazy images.
+    """
+    key, owner = (None, None) if _is_mutable(image) else _cache_key(image)
+    if key is not None and sample:
+        key = key + ("sample",)
+    if key is not None:
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is not None and entry[0]() is owner:
+                _cache.move_to_end(key)
+                statistics = entry[1]
+                if not sample:
+                    # the histogram, if not computed yet, is computed from the same data seen through this image
+                    statistics._set_source(image, weak=True)
+                return statistics
+
+    if sample:
+        sample_image = _strided_sample(image)
+        statistics = _compute_statistics(sample_image)
+        # the sample is temporary, its histogram is needed anyway for estimating percentiles
+        statistics.counts
+    else:
+        statistics = _compute_statistics(image)
+
+    if key is not None:
+        if not sample:
+            statistics._set_source(image, weak=True)
+        with _cache_lock:
+            _cache[key] = (weakref.ref(owner), statistics)
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+    return statistics
+
+
+def _auto_display_range(image, lower_percentile:float=0.1, upper_percentile:float=99.9):
+    """Estimates a display range for the whole image from percentiles of a strided sample."""
+    display_min, display_max = _image_statistics(image, sample=True).percentile([lower_percentile, upper_percentile])
+    return float(display_min), float(display_max)
+
+
+def _strided_sample(image):
+    """Returns every n-th plane and every n-th pixel in Y and X of the image."""
+    shape = tuple(image.shape)
+    is_rgb = len(shape) > 2 and shape[-1] in [3, 4]
+    num_planes = len(shape) - (3 if is_rgb else 2)
+    samples = [_SAMPLE_PLANES] * num_planes + [_SAMPLE_SIZE, _SAMPLE_SIZE] + ([shape[-1]] if is_rgb else [])
+    index = tuple(slice(None, None, max(1, -(-length // num_samples))) for length, num_samples in zip(shape, samples))
+    return image[index]
+
+
+def _cache_key(image):
+    """Returns a cache key for the image and the object whose lifetime guarantees that
+    the key still refers to the same data, or (None, None) if the image cannot be cached."""
+    if isinstance(image, np.ndarray):
+        # views of the same array share statistics; as long as the array owning the memory
+        # is alive, no other array can have the same buffer address
+        owner = image
+        while isinstance(owner.base, np.ndarray):
+            owner = owner.base
+        key = ("ndarray", image.__array_interface__['data'][0], image.shape, image.strides, image.dtype.str)
+    else:
+        owner = image
+        key = ("object", id(image), tuple(image.shape), str(image.dtype))
+    try:
+        weakref.ref(owner)
+    except TypeError:
+        return None, None
+    return key, owner
+
+
+def _chunks(image):
+    """Yields the image in numpy chunks of about _CHUNK_PIXELS pixels."""
+    shape = tuple(image.shape)
+    if len(shape) == 0:
+        yield np.asarray(image)
+        return
+    pixels_per_item = int(np.prod(shape[1:]))
+    step = max(1, _CHUNK_PIXELS // max(1, pixels_per_item))
+    for start in range(0, shape[0], step):
+        yield _to_numpy(image[start:start + step])
+
+
+def _compute_statistics(image):
+    """Determines minimum and maximum of the image in a single chunked pass."""
+    dtype = np.dtype(image.dtype)
+    reduce_min, reduce_max = (np.nanmin, np.nanmax) if dtype.kind in "fc" else (np.min, np.max)
+    minimum, maximum = None, None
+    for chunk in _chunks(image):
+        if chunk.size == 0:
+            continue
+        chunk_min, chunk_max = reduce_min(chunk), reduce_max(chunk)
+        minimum = chunk_min if minimum is None else min(minimum, chunk_min)
+        maximum = chunk_max if maximum is None else max(maximum, chunk_max)
+    if minimum is None:
+        return _ImageStatistics(dtype.type(0), dtype.type(0), image)
+    return _ImageStatistics(minimum, maximum, image)
+
+
+def _compute_histogram(image, minimum, maximum):
+    """Returns the histogram counts and bin edges of the image between minimum and maximum."""
+    dtype = np.dtype(image.dtype)
+    if dtype == bool or (dtype.kind in "ui" and dtype.itemsize <= 2):
+        # exact histogram with one bin per value between minimum and maximum, bins are centered on the values
+        minimum, maximum = int(minimum), int(maximum)
+        counts = np.zeros(maximum - minimum + 1, dtype=np.int64)
+        for chunk in _chunks(image):
+            values = chunk.ravel()
+            if minimum != 0 or dtype == bool:
+                values = values.astype(np.int32) - minimum
+            counts += np.bincount(values, minlength=len(counts))[:len(counts)]
+        return counts, np.arange(minimum, maximum + 2) - 0.5
+
+    counts = np.zeros(_NUM_BINS, dtype=np.int64)
+    value_range = (float(minimum), float(maximum))
+    if np.isfinite(value_range).all():
+        for chunk in _chunks(image):
+            counts += np.histogram(chunk, bins=_NUM_BINS, range=value_range)[0]
+    return counts, np.linspace(value_range[0], value_range[1], _NUM_BINS + 1)
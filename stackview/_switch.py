@@ -68,7 +68,8 @@ def switch(images,
         names = [str(i) for i in range(len(images))]
         layout = ipywidgets.Layout(min_width='10px', max_width='30px')
 
-    images = [image.get() if 'cupy.ndarray' in str(type(image)) else image for image in images]
+    from ._arrays import _as_array
+    images = [_as_array(image, device=False) for image in images]
 
     viewer = _SliceViewer(images[0],
                           slice_number,
@@ -89,19 +90,21 @@ def switch(images,
     buttons = []
 
     if toggleable:
+        from ._compositing import _Compositor
+        compositor = _Compositor()
+
         def display_(buttons, images, colormap, display_min, display_max):
-            display_image = None
+            layers = []
             for button, image, colormap_, display_min_, display_max_ in zip(buttons, images, colormap,
                                                                              display_min, display_max):
                 if button.value:
-                    display_image_to_add = _image_stack_to_rgb(image, display_min=display_min_, display_max=display_max_, colormap=colormap_)
-                        
-                    if display_image is None:
-                        display_image = display_image_to_add
-                    else:
-                        display_image = display_image + display_image_to_add
-
-            display_image = np.minimum(display_image, np.asarray([[255]]))
+                    layers.append(_image_stack_to_rgb(image, display_min=display_min_, display_max=display_max_, colormap=colormap_))
+
+            if len(layers) == 0:
+                # nothing selected: show black
+                layers = [np.zeros_like(_image_stack_to_rgb(images[0], display_min=display_min[0], display_max=display_max[0], colormap=colormap[0]))]
+            # the sum of all selected images, saturating at 255
+            display_image = compositor.composite(layers, modes="add")
 
             viewer.view.colormap = None
             viewer.view.display_min = None
@@ -50,14 +50,15 @@ def intSlider(min:int=0, max:int=100, step:int=1, value:int=1, continuous_update
 
     box = ipywidgets.VBox([ipywidgets.HBox([label, slider]),html])
 
-    def observe(*args, **kwargs):
-        slider.observe(*args, **kwargs)
+    def observe(handler, names='value', **kwargs):
+        # only value changes are forwarded; the slider also changes e.g. its _property_lock for every value change
+        slider.observe(handler, names=names, **kwargs)
     box.observe = observe
 
     def update(event=None):
         box.value = slider.value
 
-    slider.observe(update)
+    slider.observe(update, names='value')
 
     def _set_value_min_max(value, min, max):
         slider.value = value
@@ -66,6 +67,11 @@ def intSlider(min:int=0, max:int=100, step:int=1, value:int=1, continuous_update
 
     box._set_value_min_max = _set_value_min_max
 
+    def _set_value(value):
+        slider.value = value
+
+    box._set_value = _set_value
+
     update()
 
     return box
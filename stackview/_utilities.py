@@ -7,16 +7,8 @@ def merge_rgb(image_red, image_green, image_blue):
     return np.asarray([image_red, image_green, image_blue]).swapaxes(0, 2)
 
 def is_image(image):
-    return isinstance(image, np.ndarray) or \
-        str(type(image)) in ["<class 'cupy._core.core.ndarray'>",
-                             "<class 'dask.array.core.Array'>",
-                             "<class 'xarray.core.dataarray.DataArray'>",
-                             "<class 'resource_backed_dask_array.ResourceBackedDaskArray'>",
-                             "<class 'torch.Tensor'>",
-                             "<class 'pyclesperanto_prototype._tier0._cuda_backend.CUDAArray'>",
-                             "<class 'pyclesperanto_prototype._tier0._pycl.OCLArray'>"]
-        # isinstance(image, tuple) or \
-        # isinstance(image, list) or \
+    from ._arrays import _backend
+    return _backend(image) is not None
 
 
 def is_label_image(image):
@@ -56,6 +48,64 @@ def parameter_is_image_parameter(parameter):
             "mask" in name.lower()
             )
 
+class _LRUCache():
+    """
+    Thread-safe dictionary-like cache of numpy arrays (or tuples containing arrays) that evicts
+    the least recently used entries once the total size of the stored arrays exceeds max_bytes.
+    """
+    def __init__(self, max_bytes:int):
+        from collections import OrderedDict
+        from threading import Lock
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, key):
+        with self._lock:
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def __setitem__(self, key, value):
+        num_bytes = _nbytes(value)
+        with self._lock:
+            if key in self._items:
+                self.num_bytes -= _nbytes(self._items.pop(key))
+            if num_bytes > self.max_bytes:
+                return
+            self._items[key] = value
+            self.num_bytes += num_bytes
+            while self.num_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.num_bytes -= _nbytes(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.num_bytes = 0
+
+
+def _nbytes(value):
+    if isinstance(value, tuple):
+        return sum([_nbytes(v) for v in value])
+    if isinstance(value, bytes):
+        return len(value)
+    return getattr(value, 'nbytes', 0)
+
+
 def _no_resize(widget):
     import ipywidgets
     return ipywidgets.HBox([ipywidgets.VBox([widget])])
@@ -65,36 +115,118 @@ def _no_resize(widget):
 
 def numpy_to_gif_bytestream(timelapse, frame_delay_ms=100, num_loops=1000):
     """Turn a NumPy array into a bytestream"""
-    import numpy as np
-    import imageio
-    import io
+    return _encode_animation(timelapse, "gif", frame_delay_ms=frame_delay_ms, num_loops=num_loops)
+
+
+def _encode_animation(frames, image_format:str="gif", frame_delay_ms:int=100, num_loops:int=1000, quality:int=80, palette=None):
+    """Encode an iterable of RGB frames into an animated "gif", "webp" or "mp4" file and return its bytes.
 
-    # Convert the NumPy array to a PIL Image
-    # image = Image.fromarray(data.astype(np.uint8)).convert("RGBA")
+    Frames are consumed one by one, so that they can be generated lazily. GIF frames are
+    quantized in parallel threads.
 
-    # Create a BytesIO object
+    If a (<=256, 3) uint8 palette is given, it is used for all frames. Frames can then also be
+    2D uint8 images of indices into the palette, which are written to GIF files without quantization.
+    """
+    import io
+    import numpy as np
+    from PIL import Image
+
+    frames = (np.asarray(frame).astype(np.uint8, copy=False) for frame in frames)
     bytes_io = io.BytesIO()
 
-    # Save the PIL image to the BytesIO object as a PNG
-    # image.save(bytes_io, format='GIF')
+    if palette is not None and image_format != "gif":
+        frames = (np.asarray(palette)[frame] if len(frame.shape) == 2 else frame for frame in frames)
+
+    if image_format == "gif" and palette is not None:
+        # a global colour table shared by all frames: no per-frame palettes and no flickering colours
+        palette_bytes = np.asarray(palette, dtype=np.uint8).tobytes()
+        palette_image = Image.new("P", (1, 1))
+        palette_image.putpalette(palette_bytes)
+        images = _map_in_threads(lambda frame: _frame_to_palette(frame, palette_image), frames)
+        first = next(images)
+        first.save(bytes_io, format="GIF", save_all=True, append_images=images, duration=frame_delay_ms, loop=num_loops,
+                   palette=palette_bytes, optimize=False)
+    elif image_format == "gif":
+        images = _map_in_threads(_quantize_frame, frames)
+        first = next(images)
+        first.save(bytes_io, format="GIF", save_all=True, append_images=images, duration=frame_delay_ms, loop=num_loops)
+    elif image_format == "webp":
+        images = (Image.fromarray(frame) for frame in frames)
+        first = next(images)
+        first.save(bytes_io, format="WEBP", save_all=True, append_images=images, duration=frame_delay_ms, loop=num_loops, quality=quality)
+    elif image_format == "mp4":
+        # ffmpeg needs a file to write to
+        import os
+        import tempfile
+        import imageio
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "animation.mp4")
+            with imageio.get_writer(filename, format="FFMPEG", fps=1000 / frame_delay_ms) as writer:
+                for frame in frames:
+                    writer.append_data(frame)
+            with open(filename, "rb") as file:
+                return file.read()
+    else:
+        raise ValueError("Unsupported animation format: " + str(image_format))
+
+    return bytes_io.getvalue()
+
+
+def _quantize_frame(frame):
+    from PIL import Image
+    return Image.fromarray(frame).quantize(256)
 
-    with imageio.get_writer(bytes_io, mode='I', duration=frame_delay_ms, loop=num_loops, format="GIF") as writer:
-        for frame in timelapse:
-            writer.append_data(frame.astype(np.uint8))
 
-    # return the beginning of the file as a bytestream
-    bytes_io.seek(0)
-    return bytes_io.read()
+def _frame_to_palette(frame, palette_image):
+    """Turns a frame of palette indices or an RGB frame into a "P" image with the palette of palette_image."""
+    from PIL import Image
+    if len(frame.shape) == 2:
+        image = Image.fromarray(frame)
+        image.putpalette(palette_image.getpalette())
+        return image
+    return Image.fromarray(frame[..., :3]).quantize(palette=palette_image, dither=Image.Dither.NONE)
+
+
+def _shared_palette(rgb_images, num_colors:int=256):
+    """Computes one palette for all given RGB images, e.g. the sources of blended animation frames."""
+    import numpy as np
+    from PIL import Image
+    mosaic = np.concatenate([np.asarray(image, dtype=np.uint8)[..., :3].reshape(-1, 1, 3) for image in rgb_images])
+    palette = Image.fromarray(mosaic).quantize(num_colors).getpalette()[:3 * num_colors]
+    return np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+
+
+def _map_in_threads(function, iterable, num_threads:int=4):
+    """Like map(), but runs function in parallel threads. At most 2 * num_threads items are
+    processed ahead of the consumer, so that iterable is never loaded into memory completely."""
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        futures = deque()
+        for item in iterable:
+            futures.append(executor.submit(function, item))
+            if len(futures) >= 2 * num_threads:
+                yield futures.popleft().result()
+        while len(futures) > 0:
+            yield futures.popleft().result()
 
 
 def _gif_to_html(gif, width=None):
+    return _animation_to_html(gif, width=width, image_format="gif")
+
+
+def _animation_to_html(data, width=None, image_format:str="gif"):
     import base64
 
     style = ""
     if width is not None:
         style = f"style=\"width: {width}px;\""
 
-    url = 'data:image/gif;base64,' + base64.b64encode(gif).decode('utf-8')
+    if image_format == "mp4":
+        url = 'data:video/mp4;base64,' + base64.b64encode(data).decode('utf-8')
+        return f'<video src="{url}" {style} autoplay loop muted playsinline></video>'
+
+    url = f'data:image/{image_format};base64,' + base64.b64encode(data).decode('utf-8')
     return f'<img src="{url}" {style}></img>'
 
 import ipywidgets
@@ -43,18 +43,20 @@ def zoom(
     import ipywidgets
     from ipyevents import Event
     from ._slice_viewer import _SliceViewer
+    from ._statistics import _image_statistics
     import numpy as np
     import matplotlib.pyplot as plt
     from ._grid import grid
+    from ._arrays import _as_array
 
-    if 'cupy.ndarray' in str(type(image)):
-        image = image.get()
+    image = _as_array(image, device=False)
 
     if slice_number is None:
         slice_number = int(image.shape[0] / 2)
 
-    total_min = float(image.min())
-    total_max = float(image.max())
+    statistics = _image_statistics(image)
+    total_min = float(statistics.min)
+    total_max = float(statistics.max)
 
     # Image view
     viewer = _SliceViewer(image,
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture
+def widget_tree():
+    """Returns a function listing a widget and all widgets nested in it, depth-first."""
+    def all_widgets(widget):
+        return [widget] + [w for child in getattr(widget, 'children', []) for w in all_widgets(child)]
+    return all_widgets
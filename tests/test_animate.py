@@ -0,0 +1,65 @@
+def test_animate_writes_the_shown_animation(tmp_path):
+    import numpy as np
+    import pytest
+    import stackview
+    from PIL import Image
+
+    timelapse = np.random.randint(0, 255, (5, 20, 30)).astype(np.uint8)
+
+    for image_format in ["gif", "webp"]:
+        filename = str(tmp_path / ("animation." + image_format))
+        html = stackview.animate(timelapse, filename=filename)
+
+        with open(filename, "rb") as file:
+            import base64
+            assert base64.b64encode(file.read()).decode('utf-8') in html.data
+        animation = Image.open(filename)
+        assert animation.n_frames == 5
+        assert animation.size == (30, 20)
+
+    with pytest.raises(ValueError):
+        stackview.animate(timelapse, image_format="bmp")
+
+
+def test_animate_uses_colormap_as_palette(tmp_path):
+    import numpy as np
+    import stackview
+    from PIL import Image
+    from stackview._image_widget import _img_to_rgb
+
+    timelapse = np.random.random((4, 20, 30)) * 200
+    filename = str(tmp_path / "animation.gif")
+    stackview.animate(timelapse, filename=filename, colormap="viridis")
+
+    animation = Image.open(filename)
+    for i in range(4):
+        animation.seek(i)
+        assert np.array_equal(np.asarray(animation.convert("RGB")), _img_to_rgb(timelapse[i], colormap="viridis"))
+
+
+def test_animate_curtain_and_blend_frames(monkeypatch):
+    import numpy as np
+    import stackview
+    from stackview import _animate
+    from stackview._image_widget import _img_to_rgb
+
+    captured = {}
+    monkeypatch.setattr(_animate, "_animate_frames", lambda frames, *args, **kwargs: captured.update(frames=frames))
+
+    image1 = np.random.randint(0, 255, (20, 40)).astype(np.uint8)
+    image2 = np.random.randint(0, 255, (20, 40)).astype(np.uint8)
+
+    stackview.animate_curtain(image1, image2, num_steps=4)
+    frames = captured['frames']
+    assert len(frames) == 6
+    assert frames[1] is frames[-2]
+    expected = _img_to_rgb(image1).copy()
+    expected[:, 20:] = _img_to_rgb(image2)[:, 20:]
+    assert np.array_equal(frames[1], expected)
+
+    stackview.animate_blend(image1, image2, num_steps=5)
+    frames = captured['frames']
+    assert len(frames) == 10
+    assert np.array_equal(frames[0], _img_to_rgb(image1))
+    assert np.array_equal(frames[4], _img_to_rgb(image2))
+    assert np.abs(frames[2].astype(int) - (_img_to_rgb(image1) / 2 + _img_to_rgb(image2) / 2)).max() <= 1
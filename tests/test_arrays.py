@@ -0,0 +1,28 @@
+import numpy as np
+
+
+def test_array_handle():
+    import dask.array as da
+    import zarr
+    from stackview._arrays import _ArrayHandle, _backend
+    from stackview._utilities import is_image
+
+    image = np.random.randint(0, 100, (4, 20, 30)).astype(np.uint16)
+    z = zarr.zeros(image.shape, dtype=image.dtype)
+    z[:] = image
+
+    for array, backend in [(image, "numpy"), (da.from_array(image, chunks=(1, 20, 30)), "dask"), (z, "zarr")]:
+        assert _backend(array) == backend
+        assert is_image(array)
+
+        handle = _ArrayHandle(array)
+        assert handle.shape == image.shape
+        assert handle.dtype == image.dtype
+        plane = handle.get_plane((2,))
+        assert isinstance(plane, np.ndarray)
+        assert np.array_equal(plane, image[2])
+        assert handle.stats().max == image.max()
+
+    # numpy arrays are not copied
+    assert _ArrayHandle(image).array is image
+    assert not is_image([1, 2, 3])
@@ -0,0 +1,29 @@
+def test_compositor():
+    import numpy as np
+    import pytest
+    from stackview._compositing import _Compositor
+
+    a = np.random.randint(0, 256, (10, 20, 3)).astype(np.uint8)
+    b = np.random.randint(0, 256, (10, 20, 3)).astype(np.uint8)
+    compositor = _Compositor()
+
+    result = compositor.composite([a, b], alphas=[1, 0.25])
+    assert result.dtype == np.uint8
+    assert np.abs(result.astype(float) - (0.75 * a + 0.25 * b)).max() <= 1
+    # results are not overwritten by the next frame, unless written into the same out buffer
+    result_copy = result.copy()
+    assert compositor.composite([b, a], alphas=[1, 0.5]) is not result
+    assert np.array_equal(result, result_copy)
+    assert compositor.composite([b, a], alphas=[1, 0.5], out=result) is result
+
+    assert np.array_equal(compositor.composite([a, b], alphas=[1, 1]), b)
+    assert np.array_equal(compositor.composite([a, b], modes="add"), np.minimum(a.astype(int) + b, 255))
+    assert np.array_equal(compositor.composite([a, b], modes="max"), np.maximum(a, b))
+    with pytest.raises(ValueError):
+        compositor.composite([a, b], modes="multiply")
+
+    # blending into a part of an image
+    result = compositor.composite([a]).copy()
+    compositor.blend(result[:, 5:], b[:, 5:], 1)
+    assert np.array_equal(result[:, :5], a[:, :5])
+    assert np.array_equal(result[:, 5:], b[:, 5:])
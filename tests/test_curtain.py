@@ -0,0 +1,28 @@
+def test_curtain_and_blend_colorize_only_when_the_slice_changes(monkeypatch, widget_tree):
+    import numpy as np
+    import stackview
+    from stackview import _image_widget
+
+    # count colorizations of the (float) slices; the view itself converts the uint8 composite as well
+    colorized = []
+    img_to_rgb = _image_widget._img_to_rgb
+
+    def counting_img_to_rgb(image, **kwargs):
+        if image.dtype != np.uint8:
+            colorized.append(image)
+        return img_to_rgb(image, **kwargs)
+
+    monkeypatch.setattr(_image_widget, "_img_to_rgb", counting_img_to_rgb)
+
+    image1 = np.random.random((5, 20, 30))
+    image2 = np.random.random((5, 20, 30))
+
+    for widget in [stackview.curtain(image1, image2), stackview.blend(image1, image2)]:
+        slice_slider, overlay_slider = [w for w in widget_tree(widget) if hasattr(w, '_set_value')]
+        colorized.clear()
+        overlay_slider._set_value(10)
+        assert len(colorized) == 0
+        slice_slider._set_value(1)
+        assert len(colorized) == 2
+        widget.update()
+        assert len(colorized) == 4
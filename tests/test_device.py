@@ -0,0 +1,20 @@
+import numpy as np
+
+
+def test_device_colorization_matches_host_colorization():
+    from stackview._device import _device_img_to_rgb
+    from stackview._image_widget import _img_to_rgb
+
+    images = [
+        np.random.random((20, 30)).astype(np.float32),
+        np.random.randint(0, 4000, (20, 30)).astype(np.uint16),
+        np.random.randint(0, 1000, (20, 30)).astype(np.uint32),
+        np.random.random((20, 30)) > 0.5,
+        np.random.randint(0, 255, (20, 30, 3)).astype(np.uint8),
+    ]
+    for image in images:
+        for display_range in [(None, None), (0.2, 0.8), (100, 3000)]:
+            expected = _img_to_rgb(image, colormap="viridis", display_min=display_range[0], display_max=display_range[1])
+            result = _device_img_to_rgb(image, colormap="viridis", display_min=display_range[0], display_max=display_range[1])
+            assert result.dtype == np.uint8
+            assert np.array_equal(result, expected)
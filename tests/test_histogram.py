@@ -0,0 +1,122 @@
+def test_region_histograms():
+    import numpy as np
+    from stackview._histogram import _RegionHistograms
+
+    image = np.random.random((40, 50))
+    expected = np.histogram(image[5:25, 10:40], bins=32, range=(0, 1))[0]
+
+    histograms = _RegionHistograms(image, (0, 1))
+    assert histograms.table is not None
+    assert np.array_equal(histograms(10, 5, 30, 20), expected)
+    assert histograms().sum() == image.size
+
+    histograms = _RegionHistograms(image, (0, 1), max_table_entries=0)
+    assert histograms.table is None
+    assert np.array_equal(histograms(10, 5, 30, 20), expected)
+
+
+def test_histogram_follows_drawn_rectangle(widget_tree):
+    import numpy as np
+    import stackview
+    from ipyevents import Event
+    from ipywidgets.widgets.widget import _instances
+    from stackview._image_widget import ImageWidget
+
+    image = np.zeros((3, 40, 50))
+    image[:, :20] = 1
+    widget = stackview.histogram(image)
+
+    view, histogram_view = [w for w in widget_tree(widget) if isinstance(w, ImageWidget)]
+    event_handler = [w for w in _instances.values() if isinstance(w, Event) and w.source is view][-1]
+
+    def mouse_move(x, y, buttons=1):
+        event_handler._dom_handlers({'relativeX': x, 'relativeY': y, 'buttons': buttons})
+
+    # while drawing the rectangle, the histogram is updated
+    mouse_move(0, 30)
+    mouse_move(10, 39)
+    bars = histogram_view.data[-1, :, 0] != 255
+    assert bars[0] and not bars[-1]
+    mouse_move(10, 0)
+    bars = histogram_view.data[-1, :, 0] != 255
+    assert bars[0] and bars[-1]
+
+
+def test_region_statistics():
+    import numpy as np
+    from stackview._histogram import _RegionStatistics
+
+    image = np.random.randint(0, 1000, (37, 53)).astype(np.uint16)
+    cropped_image = image[3:30, 10:47]
+    for region_statistics in [_RegionStatistics(image), _RegionStatistics(image, max_table_entries=0)]:
+        statistics = region_statistics(10, 3, 37, 27)
+        assert statistics['min'] == cropped_image.min()
+        assert statistics['max'] == cropped_image.max()
+        assert statistics['sum'] == cropped_image.sum()
+        assert np.isclose(statistics['mean'], cropped_image.mean())
+        assert np.isclose(statistics['std'], cropped_image.std())
+        assert region_statistics(10, 3, 0, 27) is None
+
+
+def test_region_tables_are_built_lazily():
+    import numpy as np
+    from stackview._histogram import _RegionHistograms, _RegionStatistics
+
+    image = np.random.random((37, 53))
+    histograms = _RegionHistograms(image, (0, 1))
+    statistics = _RegionStatistics(image)
+
+    # the whole slice is measured without tables, e.g. while no rectangle is drawn
+    assert histograms().sum() == image.size
+    assert np.isclose(statistics()['std'], image.std())
+    assert histograms._table is None
+    assert statistics.sums is None and statistics.min_tables is None
+
+    assert statistics(10, 3, 37, 27)['max'] == image[3:30, 10:47].max()
+    assert histograms(10, 3, 37, 27).sum() == 37 * 27
+    assert histograms._table is not None
+    assert statistics.sums is not None and statistics.min_tables is not None
+
+
+def test_histogram_statistics_of_current_slice(widget_tree):
+    import numpy as np
+    import ipywidgets
+    import stackview
+
+    image = np.zeros((3, 40, 50))
+    image[0] = 5
+    image[1, :20] = 1
+    image[1, 20:] = 2
+    widget = stackview.histogram(image)
+
+    def table():
+        values = [w.value for w in widget_tree(widget) if isinstance(w, ipywidgets.Label)]
+        return {key: values[values.index(key) + 1] for key in ["min", "max", "mean", "std"]}
+
+    # min, max, mean and std all refer to the shown slice
+    assert table() == {"min": "1", "max": "2", "mean": "1.5", "std": "0.5"}
+
+    slice_slider = [w for w in widget_tree(widget) if hasattr(w, '_set_value')][0]
+    slice_slider._set_value(0)
+    assert table() == {"min": "5", "max": "5", "mean": "5", "std": "0"}
+
+
+def test_histogram_update_after_modifying_image(widget_tree):
+    import numpy as np
+    import ipywidgets
+    import stackview
+
+    image = np.zeros((3, 40, 50))
+    image[1] = 1
+    widget = stackview.histogram(image)
+
+    def mean():
+        values = [w.value for w in widget_tree(widget) if isinstance(w, ipywidgets.Label)]
+        return values[values.index("mean") + 1]
+
+    assert mean() == "1"
+
+    # modifying the image in place and calling update() shows the new data
+    image[1] = 7
+    widget.update()
+    assert mean() == "7"
@@ -0,0 +1,201 @@
+def test_img_to_rgb_grey():
+    import numpy as np
+    from stackview._image_widget import _img_to_rgb
+
+    image = np.asarray([
+        [0, 1],
+        [2, 4]
+    ], dtype=np.float32)
+
+    rgb = _img_to_rgb(image)
+
+    assert rgb.shape == (2, 2, 3)
+    assert rgb.dtype == np.uint8
+    assert rgb.flags['C_CONTIGUOUS']
+    assert np.array_equal(rgb[..., 0], [[0, 63], [127, 255]])
+    assert np.array_equal(rgb[..., 0], rgb[..., 2])
+
+
+def test_img_to_rgb_display_range_is_clipped():
+    import numpy as np
+    from stackview._image_widget import _img_to_rgb
+
+    image = np.asarray([
+        [-10, 0],
+        [10, 20]
+    ], dtype=np.float64)
+
+    rgb = _img_to_rgb(image, display_min=0, display_max=10)
+
+    assert np.array_equal(rgb[..., 0], [[0, 0], [255, 255]])
+
+
+def test_img_to_rgb_colormap_and_out():
+    import numpy as np
+    from stackview._image_widget import _img_to_rgb
+    from stackview import create_colormap
+
+    image = np.random.random((10, 20))
+    out = np.zeros((10, 20, 3), dtype=np.uint8)
+
+    rgb = _img_to_rgb(image, colormap="viridis", display_min=0, display_max=1, out=out)
+
+    lut = np.asarray(create_colormap("viridis").colors)
+    reference = (lut[(image * 255).astype(np.uint8), :3] * 255).astype(np.uint8)
+
+    assert rgb is out
+    assert np.array_equal(rgb, reference)
+
+
+def test_img_to_rgb_integer_lut():
+    import numpy as np
+    from stackview._image_widget import _img_to_rgb
+
+    for dtype in [np.uint8, np.int8, np.uint16, np.int16]:
+        image = np.asarray([
+            [-5, 0],
+            [50, 100]
+        ]).astype(dtype)
+
+        rgb = _img_to_rgb(image, display_min=0, display_max=50)
+        reference = _img_to_rgb(image.astype(np.float32), display_min=0, display_max=50)
+
+        assert rgb.dtype == np.uint8
+        assert np.array_equal(rgb, reference)
+
+
+def test_img_to_rgb_labels():
+    import numpy as np
+    from stackview._image_widget import _img_to_rgb
+    from stackview._colormaps import _labels_lut
+
+    labels = np.asarray([
+        [0, 1],
+        [2, 70000]
+    ], dtype=np.uint64)
+
+    rgb = _img_to_rgb(labels)
+    lut = (_labels_lut() * 255).astype(np.uint8)
+
+    assert rgb.dtype == np.uint8
+    assert np.array_equal(rgb[0, 0], [0, 0, 0])
+    assert np.array_equal(rgb[0, 1], lut[1])
+    assert np.array_equal(rgb[1, 0], lut[2])
+    # label IDs beyond the LUT size wrap around, but never become background
+    assert not np.array_equal(rgb[1, 1], [0, 0, 0])
+
+
+def test_large_label_frames_are_lossless():
+    import numpy as np
+    from io import BytesIO
+    from PIL import Image
+    from stackview._image_widget import ImageWidget, _img_to_rgb
+
+    labels = np.random.randint(0, 1000, (600, 700)).astype(np.uint32)
+    view = ImageWidget(labels)
+
+    assert view._last_frame.startswith(b'\x89PNG')
+    assert np.array_equal(np.asarray(Image.open(BytesIO(view._last_frame))), _img_to_rgb(labels))
+
+    # e.g. label overlays
+    overlay = _img_to_rgb(labels)
+    view = ImageWidget(overlay, lossless=True)
+    assert np.array_equal(np.asarray(Image.open(BytesIO(view._last_frame))), overlay)
+
+
+def test_annotate_float_labels():
+    import numpy as np
+    import pytest
+    import stackview
+    from stackview._image_widget import _labels_to_rgb
+
+    labels = np.zeros((3, 10, 20))
+    labels[1, 2:5, 3:8] = 2
+
+    assert np.array_equal(_labels_to_rgb(labels[1]), _labels_to_rgb(labels[1].astype(np.uint32)))
+    with pytest.warns(UserWarning):
+        stackview.annotate(np.random.random((3, 10, 20)), labels)
+
+
+def test_encode_frame():
+    import numpy as np
+    import pytest
+    from io import BytesIO
+    from PIL import Image
+    from stackview._image_widget import _encode_frame
+
+    small = np.random.random((10, 20, 3)) * 255
+    large = np.zeros((1024, 1024, 3), dtype=np.uint8)
+
+    assert _encode_frame(small).startswith(b'\x89PNG')
+    assert _encode_frame(large).startswith(b'\xff\xd8')
+    assert _encode_frame(large, image_format="png").startswith(b'\x89PNG')
+
+    decoded = np.asarray(Image.open(BytesIO(_encode_frame(small))))
+    assert np.array_equal(decoded, small.astype(np.uint8))
+
+    with pytest.raises(ValueError):
+        _encode_frame(small, image_format="bmp")
+
+
+def test_update_region():
+    import numpy as np
+    from stackview._image_widget import ImageWidget
+
+    image = np.zeros((10, 10), dtype=np.uint8)
+    image[0, 0] = 100
+    view = ImageWidget(image, zoom_factor=2)
+
+    sent = []
+    view._put_frame = lambda rgb, x, y, lossless=False: sent.append((rgb, x, y))
+    view.update_region(2, 4, 3, 6, np.full((2, 3), 50, dtype=np.uint8))
+
+    # the array passed in is not modified
+    assert image.max() == 100
+    assert view.data[2:4, 3:6].min() == 50
+
+    # only the zoomed region is sent, rendered with the display range of the whole image
+    rgb, x, y = sent[0]
+    assert (x, y) == (6, 4)
+    assert rgb.shape == (4, 6, 3)
+    assert rgb.min() == 127 and rgb.max() == 127
+
+
+def test_update_region_zoomed_out():
+    import numpy as np
+    from stackview._image_widget import ImageWidget
+
+    image = np.zeros((20, 20), dtype=np.uint8)
+    image[0, 0] = 255
+    view = ImageWidget(image, zoom_factor=0.5, display_min=0, display_max=255)
+
+    sent = []
+    view._put_frame = lambda rgb, x, y, lossless=False: sent.append((rgb, x, y))
+    patch = np.zeros((4, 4), dtype=np.uint8)
+    patch[0] = 255
+    view.update_region(3, 7, 3, 7, patch)
+
+    # the sent pixels equal the corresponding part of a full rendering
+    rgb, x, y = sent[0]
+    full_frame = view._render(view.data)[0]
+    assert np.array_equal(rgb, full_frame[y:y + rgb.shape[0], x:x + rgb.shape[1]])
+    assert rgb.max() == 0
+
+
+def test_zoom_matches_affine_transform():
+    import numpy as np
+    from scipy.ndimage import affine_transform
+    from stackview._image_widget import ImageWidget
+
+    image = np.random.random((33, 20))
+
+    for zoom_factor in [0.3, 0.5, 1.5, 2, 3]:
+        view = ImageWidget(image, zoom_factor=zoom_factor)
+        matrix = np.asarray([[1.0 / zoom_factor, 0, -0.5],
+                             [0, 1.0 / zoom_factor, -0.5],
+                             [0, 0, 1]])
+        zoomed_shape = (np.asarray(image.shape) * zoom_factor).astype(int)
+        reference = affine_transform(image, matrix, output_shape=zoomed_shape, order=0, mode='nearest')
+
+        assert np.array_equal(view._zoom(image), reference)
+
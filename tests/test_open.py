@@ -0,0 +1,77 @@
+def test_open_npy(tmp_path):
+    import numpy as np
+    import stackview
+
+    image = np.random.random((5, 10, 20))
+    filename = str(tmp_path / "image.npy")
+    np.save(filename, image)
+
+    result = stackview.open(filename)
+
+    assert isinstance(result.viewer.image, np.memmap)
+    assert np.array_equal(result.viewer.view.data, image[2])
+
+
+def test_open_tif(tmp_path):
+    import numpy as np
+    import stackview
+    import pytest
+    tifffile = pytest.importorskip("tifffile")
+
+    image = np.random.randint(0, 255, (2, 3, 10, 20)).astype(np.uint8)
+    filename = str(tmp_path / "image.tif")
+    tifffile.imwrite(filename, image, tile=(16, 16), photometric="minisblack")
+
+    result = stackview.open(filename, cache_size_mb=0.001)
+    lazy_image = result.viewer.image
+
+    assert lazy_image.shape == image.shape
+    assert np.array_equal(result.viewer.view.data, image[1, 1])
+    assert np.array_equal(lazy_image[0, 2], image[0, 2])
+    assert np.array_equal(lazy_image[:, 1, 2:5], image[:, 1, 2:5])
+    assert np.array_equal(lazy_image[..., 3], image[..., 3])
+    # only few pages fit into the cache
+    assert lazy_image._cache.num_bytes <= 0.001 * 1024 * 1024
+
+
+def test_open_tif_closes_file(tmp_path):
+    import numpy as np
+    from stackview._open import _open_lazy
+    import pytest
+    tifffile = pytest.importorskip("tifffile")
+
+    filename = str(tmp_path / "image.tif")
+    tifffile.imwrite(filename, np.zeros((3, 10, 20), dtype=np.uint8), photometric="minisblack")
+
+    lazy_image = _open_lazy(filename)
+    assert not lazy_image._file_handle.filehandle.closed
+    lazy_image.close()
+    assert lazy_image._file_handle.filehandle.closed
+
+
+def test_open_tif_threaded_reads(tmp_path):
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+    from stackview._open import _open_lazy
+    from stackview._slice_viewer import _SliceViewer
+    import pytest
+    tifffile = pytest.importorskip("tifffile")
+
+    image = np.random.randint(0, 255, (40, 64, 64)).astype(np.uint8)
+    filename = str(tmp_path / "image.tif")
+    tifffile.imwrite(filename, image, compression="zlib", photometric="minisblack")
+
+    # without cache, every read accesses the file
+    lazy_image = _open_lazy(filename, cache_size_mb=0)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        planes = list(executor.map(lambda z: lazy_image[z % 40], range(400)))
+    assert all([np.array_equal(plane, image[z % 40]) for z, plane in enumerate(planes)])
+
+    # neighboring planes are read in background threads while the slider moves
+    viewer = _SliceViewer(_open_lazy(filename, cache_size_mb=0), prefetch=4)
+    slider = viewer.sliders[0].children[0].children[1]
+    for z in range(0, 40, 3):
+        slider.value = z
+        assert np.array_equal(viewer.view.data, image[z])
+    for future in viewer._prefetch_futures:
+        future.result()
@@ -0,0 +1,17 @@
+def test_orthogonal_renders_only_the_moved_plane():
+    import numpy as np
+    import stackview
+
+    image = np.random.random((10, 20, 30))
+    widget = stackview.orthogonal(image)
+    viewers = [w.viewer for w in widget.children]
+    assert [viewer.view.crosshair for viewer in viewers] == [(10, 15), (15, 5), (10, 5)]
+
+    rendered = []
+    for i, viewer in enumerate(viewers):
+        viewer.view._render = (lambda render, i: lambda *args, **kwargs: rendered.append(i) or render(*args, **kwargs))(viewer.view._render, i)
+
+    viewers[0].sliders[-1]._set_value(3)
+    assert rendered == [0]
+    assert [viewer.view.crosshair for viewer in viewers] == [(10, 15), (15, 3), (10, 3)]
+    assert np.array_equal(viewers[0].view.data, image[3])
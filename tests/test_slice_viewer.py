@@ -0,0 +1,152 @@
+def test_slice_viewer_pyramid():
+    import numpy as np
+    from stackview._slice_viewer import _SliceViewer
+
+    image = np.random.random((3, 100, 60))
+    viewer = _SliceViewer(image, zoom_factor=0.25, multiscale=True)
+
+    assert len(viewer._pyramid) == 3
+    assert viewer.view.data.shape == (25, 15)
+    assert viewer.view.zoom_factor == 1
+
+    pyramid = [image, image[:, ::2, ::2]]
+    viewer = _SliceViewer(pyramid, zoom_factor=0.5)
+
+    assert viewer.image is image
+    assert viewer.view.data.shape == (50, 30)
+
+
+def test_slice_viewer_reads_visible_plane_only():
+    import numpy as np
+    from stackview._slice_viewer import _SliceViewer
+
+    class LazyArray():
+        def __init__(self, data):
+            self._data = data
+            self.shape = data.shape
+            self.dtype = data.dtype
+            self.requested = []
+
+        def __getitem__(self, index):
+            self.requested.append(index)
+            return self._data[index]
+
+        def __array__(self, *args, **kwargs):
+            raise AssertionError("The whole array must not be loaded")
+
+    image = LazyArray(np.random.random((4, 3, 10, 20)))
+    viewer = _SliceViewer(image)
+    viewer.sliders[0].children[0].children[1].value = 1
+
+    assert (1, 1) in image.requested
+    assert viewer.view.data.shape == (10, 20)
+
+    # neighboring planes are read in the background, but also plane by plane
+    for future in viewer._prefetch_futures:
+        future.result()
+    assert (0, 1) in image.requested
+    assert all([len(index) == 2 and all([isinstance(i, int) for i in index]) for index in image.requested])
+
+
+def test_slice_viewer_frame_cache():
+    import numpy as np
+    from stackview._slice_viewer import _SliceViewer
+
+    image = np.random.random((10, 20, 30))
+    viewer = _SliceViewer(image, prefetch=1, frame_cache_mb=64)
+    slider = viewer.sliders[0].children[0].children[1]
+
+    for future in viewer._prefetch_futures:
+        future.result()
+    assert len(viewer._frame_cache) == 3
+
+    viewer.prefetch = 0
+    rendered = []
+    render_frame = viewer._render_frame
+    viewer._render_frame = lambda index, level: rendered.append(index) or render_frame(index, level)
+
+    slider.value = 4
+    slider.value = 5
+    assert rendered == []
+    assert np.array_equal(viewer.view.data, image[5])
+
+    # explicit updates render from scratch
+    viewer.update()
+    assert rendered == [(5,)]
+
+
+def test_slice_viewer_shows_in_place_modifications():
+    import numpy as np
+    from stackview._slice_viewer import _SliceViewer
+
+    image = np.random.random((10, 20, 30))
+    viewer = _SliceViewer(image)
+    slider = viewer.sliders[0].children[0].children[1]
+
+    slider.value = 4
+    image[5] = 0
+    slider.value = 5
+    assert np.array_equal(viewer.view.data, image[5])
+    # frames of arrays which may change are not cached
+    assert len(viewer._frame_cache) == 0
+
+
+def test_slice_viewer_coalesces_slider_events():
+    import asyncio
+    import numpy as np
+    from stackview._slice_viewer import _SliceViewer
+
+    image = np.random.random((10, 20, 30))
+    viewer = _SliceViewer(image, frame_cache_mb=0, max_fps=10)
+    slider = viewer.sliders[0].children[0].children[1]
+
+    rendered = []
+    update = viewer.update
+    viewer._schedulers[0]._render = lambda event: rendered.append(slider.value) or update(event)
+
+    async def drag():
+        for value in range(10):
+            slider.value = value
+        assert viewer.rendering
+        await asyncio.sleep(0.2)
+
+    asyncio.run(drag())
+    assert rendered == [9]
+    assert not viewer.rendering
+    assert np.array_equal(viewer.view.data, image[9])
+
+
+def test_slice_viewer_async_rendering():
+    import asyncio
+    import numpy as np
+    from stackview._slice_viewer import _SliceViewer
+
+    image = np.random.random((10, 20, 30))
+    viewer = _SliceViewer(image, prefetch=0, max_fps=0, async_rendering=True)
+    slider = viewer.sliders[0].children[0].children[1]
+
+    async def drag():
+        slider.value = 3
+        await asyncio.sleep(0)
+        slider.value = 7
+        assert viewer.rendering
+        while viewer.rendering:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(drag())
+    assert np.array_equal(viewer.view.data, image[7])
+
+
+def test_slice_viewer_auto_display_range():
+    import numpy as np
+    from stackview._slice_viewer import _SliceViewer
+
+    image = np.random.randint(0, 1000, (10, 20, 30)).astype(np.uint16)
+    image[0] += 3000
+    viewer = _SliceViewer(image, display_range="auto")
+
+    assert 0 <= viewer.view.display_min < 10
+    assert 3950 < viewer.view.display_max <= 3999
+    display_range = (viewer.view.display_min, viewer.view.display_max)
+    viewer.sliders[0].children[0].children[1].value = 2
+    assert viewer.view._frame_display_range == display_range
@@ -46,3 +46,22 @@ def test_stackviewndarray_expand_dims():
 
     labels = np.expand_dims(labels, axis=0)
     print(labels)
+
+
+def test_stackviewndarray_shares_memory():
+    import numpy as np
+    import stackview
+
+    image = np.zeros((3, 4), dtype=np.uint8)
+    result = stackview.insight(image, library_name="numpy", help_url="https://numpy.org")
+
+    assert np.shares_memory(result, image)
+    assert result.library_name == "numpy"
+    assert result[1:].help_url == "https://numpy.org"
+
+    # in-place modifications of either array are visible in both, also in the html view
+    result[0, 0] = 7
+    assert image[0, 0] == 7
+    image[1, 1] = 200
+    assert result[1, 1] == 200
+    assert "<td>200</td>" in result._repr_html_()
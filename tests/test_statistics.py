@@ -0,0 +1,69 @@
+def test_image_statistics():
+    import numpy as np
+    from stackview._statistics import _image_statistics
+
+    image = np.random.randint(0, 4000, (5, 30, 40)).astype(np.uint16)
+    statistics = _image_statistics(image)
+    assert statistics.min == image.min()
+    assert statistics.max == image.max()
+    assert np.array_equal(statistics.histogram(32)[0], np.histogram(image, bins=32)[0])
+    assert abs(statistics.percentile(50) - np.percentile(image, 50)) <= 1
+
+    # views of the same read-only data share statistics
+    image.flags.writeable = False
+    statistics = _image_statistics(image)
+    assert _image_statistics(image[:]) is statistics
+    assert _image_statistics(image[1:]) is not statistics
+
+
+def test_image_statistics_of_modified_array(widget_tree):
+    import numpy as np
+    import stackview
+    from stackview._statistics import _image_statistics
+
+    image = np.zeros((5, 30, 40), dtype=np.uint16)
+    assert _image_statistics(image).max == 0
+    assert stackview.insight(image)._repr_html_().count("<td>0</td>") == 2
+
+    image[2, 10, 10] = 1000
+    assert _image_statistics(image).max == 1000
+    assert "<td>1000</td>" in stackview.insight(image)._repr_html_()
+
+    display_range_widgets = widget_tree(stackview.display_range(image))
+    maximum_slider = [w for w in display_range_widgets if getattr(w, 'description', None) == "Maximum"][0]
+    assert maximum_slider.max == 1000
+    for widget in display_range_widgets:
+        widget.close()
+
+
+def test_image_statistics_float_chunked(monkeypatch):
+    import numpy as np
+    from stackview import _statistics
+
+    monkeypatch.setattr(_statistics, "_CHUNK_PIXELS", 100)
+    image = np.random.random((10, 20, 30)).astype(np.float32)
+    statistics = _statistics._image_statistics(image)
+    assert statistics.min == image.min()
+    assert statistics.max == image.max()
+    assert statistics.counts.sum() == image.size
+    assert abs(statistics.percentile(90) - np.percentile(image, 90)) < 0.01
+
+
+def test_image_statistics_histogram_is_lazy(monkeypatch):
+    import numpy as np
+    from stackview import _statistics
+
+    image = np.random.random((5, 30, 40)).astype(np.float32)
+    computed = []
+    compute_histogram = _statistics._compute_histogram
+    monkeypatch.setattr(_statistics, "_compute_histogram", lambda *args: computed.append(1) or compute_histogram(*args))
+
+    # callers which only need minimum and maximum do not compute the histogram
+    statistics = _statistics._image_statistics(image)
+    assert statistics.min == image.min()
+    assert statistics.max == image.max()
+    assert computed == []
+
+    assert statistics.histogram(8)[0].sum() == image.size
+    statistics.percentile(50)
+    assert computed == [1]